@@ -0,0 +1,44 @@
+"""add assets variant columns
+
+Revision ID: 0b4d8e2f6a17
+Revises: f18c5b7e2d93
+Create Date: 2026-10-17 15:47:30.402618
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0b4d8e2f6a17'
+down_revision = 'f18c5b7e2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "assets",
+        sa.Column("variant", sa.String(length=20), server_default="original", nullable=False),
+    )
+    op.add_column(
+        "assets",
+        sa.Column(
+            "original_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("assets.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    op.add_column("assets", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("assets", sa.Column("height", sa.Integer(), nullable=True))
+    op.create_index("ix_assets_original_id", "assets", ["original_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_original_id", table_name="assets")
+    op.drop_column("assets", "height")
+    op.drop_column("assets", "width")
+    op.drop_column("assets", "original_id")
+    op.drop_column("assets", "variant")
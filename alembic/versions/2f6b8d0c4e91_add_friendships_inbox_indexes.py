@@ -0,0 +1,50 @@
+"""add friendships inbox indexes
+
+Revision ID: 2f6b8d0c4e91
+Revises: 7c9a2e4f1d85
+Create Date: 2026-10-17 20:14:37.602318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2f6b8d0c4e91'
+down_revision = '7c9a2e4f1d85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_friendships_requester_status_created",
+        "friendships",
+        ["requester_id", "status", "created_at"],
+    )
+    op.create_index(
+        "ix_friendships_addressee_status_created",
+        "friendships",
+        ["addressee_id", "status", "created_at"],
+    )
+    # Every lookup these served is an equality prefix of the new indexes.
+    op.drop_index("ix_friendships_status_requester", table_name="friendships")
+    op.drop_index("ix_friendships_status_addressee", table_name="friendships")
+    op.drop_index("ix_friendships_requester_id", table_name="friendships")
+    op.drop_index("ix_friendships_addressee_id", table_name="friendships")
+
+
+def downgrade() -> None:
+    op.create_index("ix_friendships_addressee_id", "friendships", ["addressee_id"])
+    op.create_index("ix_friendships_requester_id", "friendships", ["requester_id"])
+    op.create_index(
+        "ix_friendships_status_addressee",
+        "friendships",
+        ["status", "addressee_id"],
+    )
+    op.create_index(
+        "ix_friendships_status_requester",
+        "friendships",
+        ["status", "requester_id"],
+    )
+    op.drop_index("ix_friendships_addressee_status_created", table_name="friendships")
+    op.drop_index("ix_friendships_requester_status_created", table_name="friendships")
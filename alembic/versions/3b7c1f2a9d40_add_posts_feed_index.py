@@ -0,0 +1,28 @@
+"""add posts feed index
+
+Revision ID: 3b7c1f2a9d40
+Revises: 916746b69445
+Create Date: 2026-10-17 09:12:31.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7c1f2a9d40'
+down_revision = '916746b69445'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_posts_feed",
+        "posts",
+        ["is_published", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_posts_feed", table_name="posts")
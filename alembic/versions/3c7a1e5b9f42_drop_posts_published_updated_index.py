@@ -0,0 +1,29 @@
+"""drop posts published updated index
+
+Revision ID: 3c7a1e5b9f42
+Revises: 6b2e9f4a8d13
+Create Date: 2026-10-18 09:14:52.380617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7a1e5b9f42'
+down_revision = '6b2e9f4a8d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Feed ETags come from the feed.version counter; nothing reads this index.
+    op.drop_index("ix_posts_published_updated", table_name="posts")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_posts_published_updated",
+        "posts",
+        ["is_published", sa.text("updated_at DESC"), sa.text("id DESC")],
+    )
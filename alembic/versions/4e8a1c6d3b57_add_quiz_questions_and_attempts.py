@@ -0,0 +1,66 @@
+"""add quiz questions and attempts
+
+Revision ID: 4e8a1c6d3b57
+Revises: 9d3f5a7b1c26
+Create Date: 2026-10-17 22:31:09.448615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8a1c6d3b57'
+down_revision = '9d3f5a7b1c26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_questions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quiz_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("choices", sa.JSON(), nullable=False),
+        sa.Column("correct_choice", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("quiz_id", "position", name="unique_quiz_question_position"),
+    )
+    op.create_index("ix_quiz_questions_id", "quiz_questions", ["id"])
+
+    op.create_table(
+        "quiz_attempts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quiz_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("attempt_number", sa.Integer(), nullable=False),
+        sa.Column("answers", sa.JSON(), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("passed", sa.Boolean(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("time_used_seconds", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("quiz_id", "user_id", "attempt_number", name="unique_quiz_attempt_number"),
+    )
+    op.create_index("ix_quiz_attempts_id", "quiz_attempts", ["id"])
+    op.create_index("ix_quiz_attempts_user_id", "quiz_attempts", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiz_attempts_user_id", table_name="quiz_attempts")
+    op.drop_index("ix_quiz_attempts_id", table_name="quiz_attempts")
+    op.drop_table("quiz_attempts")
+    op.drop_index("ix_quiz_questions_id", table_name="quiz_questions")
+    op.drop_table("quiz_questions")
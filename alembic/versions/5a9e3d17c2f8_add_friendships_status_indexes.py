@@ -0,0 +1,33 @@
+"""add friendships status indexes
+
+Revision ID: 5a9e3d17c2f8
+Revises: c41f0a9e6b25
+Create Date: 2026-10-17 12:41:48.209655
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5a9e3d17c2f8'
+down_revision = 'c41f0a9e6b25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_friendships_status_requester",
+        "friendships",
+        ["status", "requester_id"],
+    )
+    op.create_index(
+        "ix_friendships_status_addressee",
+        "friendships",
+        ["status", "addressee_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_friendships_status_addressee", table_name="friendships")
+    op.drop_index("ix_friendships_status_requester", table_name="friendships")
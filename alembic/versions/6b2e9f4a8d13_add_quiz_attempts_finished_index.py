@@ -0,0 +1,24 @@
+"""add quiz attempts finished index
+
+Revision ID: 6b2e9f4a8d13
+Revises: 4e8a1c6d3b57
+Create Date: 2026-10-17 23:48:26.905731
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2e9f4a8d13'
+down_revision = '4e8a1c6d3b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Leaderboard catch-up after a restart: attempts finished since the snapshot.
+    op.create_index("ix_quiz_attempts_finished_at", "quiz_attempts", ["finished_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiz_attempts_finished_at", table_name="quiz_attempts")
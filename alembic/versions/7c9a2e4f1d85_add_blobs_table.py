@@ -0,0 +1,44 @@
+"""add blobs table
+
+Revision ID: 7c9a2e4f1d85
+Revises: 0b4d8e2f6a17
+Create Date: 2026-10-17 18:40:12.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c9a2e4f1d85'
+down_revision = '0b4d8e2f6a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("hash", sa.String(length=64), primary_key=True),
+        sa.Column("storage_key", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("media_type", sa.String(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.add_column(
+        "assets",
+        sa.Column(
+            "blob_hash",
+            sa.String(length=64),
+            sa.ForeignKey("blobs.hash"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_assets_blob_hash", "assets", ["blob_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_blob_hash", table_name="assets")
+    op.drop_column("assets", "blob_hash")
+    op.drop_table("blobs")
@@ -0,0 +1,32 @@
+"""add posts engagement counts
+
+Revision ID: 8e2d4c61b7a3
+Revises: 3b7c1f2a9d40
+Create Date: 2026-10-17 10:03:54.772180
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2d4c61b7a3'
+down_revision = '3b7c1f2a9d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column("view_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("like_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "like_count")
+    op.drop_column("posts", "view_count")
@@ -0,0 +1,39 @@
+"""add stat counters table
+
+Revision ID: 9d3f5a7b1c26
+Revises: 2f6b8d0c4e91
+Create Date: 2026-10-17 21:05:48.137920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f5a7b1c26'
+down_revision = '2f6b8d0c4e91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stat_counters",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("value", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    # Start from the current counts; mapper events keep them current after this.
+    op.execute(
+        """
+        INSERT INTO stat_counters (name, value, updated_at)
+        SELECT 'quizzes.total', COUNT(*), CURRENT_TIMESTAMP FROM quizzes
+        UNION ALL
+        SELECT 'quizzes.published', COUNT(*), CURRENT_TIMESTAMP FROM quizzes WHERE is_public
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stat_counters")
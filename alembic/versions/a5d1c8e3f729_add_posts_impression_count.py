@@ -0,0 +1,28 @@
+"""add posts impression count
+
+Revision ID: a5d1c8e3f729
+Revises: 3c7a1e5b9f42
+Create Date: 2026-10-18 10:02:37.614208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d1c8e3f729'
+down_revision = '3c7a1e5b9f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Homepage listings were counted as views until now; those stay in view_count.
+    op.add_column(
+        "posts",
+        sa.Column("impression_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "impression_count")
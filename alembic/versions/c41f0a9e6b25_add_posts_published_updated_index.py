@@ -0,0 +1,28 @@
+"""add posts published updated index
+
+Revision ID: c41f0a9e6b25
+Revises: 8e2d4c61b7a3
+Create Date: 2026-10-17 11:20:07.513962
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f0a9e6b25'
+down_revision = '8e2d4c61b7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_posts_published_updated",
+        "posts",
+        ["is_published", sa.text("updated_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_posts_published_updated", table_name="posts")
@@ -0,0 +1,42 @@
+"""add posts search vector
+
+Revision ID: d7b2e58a1c64
+Revises: 5a9e3d17c2f8
+Create Date: 2026-10-17 13:35:22.660318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7b2e58a1c64'
+down_revision = '5a9e3d17c2f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite search uses the FTS5 table created by init_db instead.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Generated column: Postgres recomputes it on every insert/update of the row.
+    op.execute(
+        """
+        ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_posts_search_vector")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,39 @@
+"""add users trigram indexes
+
+Revision ID: e3a6f90d4b18
+Revises: d7b2e58a1c64
+Create Date: 2026-10-17 14:18:40.925713
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a6f90d4b18'
+down_revision = 'd7b2e58a1c64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Non-Postgres databases use the in-memory autocomplete index instead.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_username_trgm "
+        "ON users USING gin (username gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_real_name_trgm "
+        "ON users USING gin (real_name gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_users_real_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_username_trgm")
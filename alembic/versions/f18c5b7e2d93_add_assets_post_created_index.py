@@ -0,0 +1,26 @@
+"""add assets post created index
+
+Revision ID: f18c5b7e2d93
+Revises: e3a6f90d4b18
+Create Date: 2026-10-17 15:02:13.184450
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f18c5b7e2d93'
+down_revision = 'e3a6f90d4b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_assets_post_created", "assets", ["post_id", "created_at"])
+    # The composite index's leading column already serves post_id lookups.
+    op.drop_index("ix_assets_post_id", table_name="assets")
+
+
+def downgrade() -> None:
+    op.create_index("ix_assets_post_id", "assets", ["post_id"])
+    op.drop_index("ix_assets_post_created", table_name="assets")
@@ -1,3 +1,3 @@
-from . import homepage, login
+from . import assets, friends, homepage, login, posts, quizzes
 
-__all__ = ["homepage", "login"]
+__all__ = ["assets", "friends", "homepage", "login", "posts", "quizzes"]
@@ -0,0 +1,194 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+import uuid
+
+from PIL import UnidentifiedImageError
+
+from app.api.routes.homepage import PostAssetResponse
+from app.core.blobs import acquire_blob, blob_key, store_blob
+from app.core.config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES
+from app.core.deps import get_verified_user
+from app.core.images import create_variant_assets
+from app.core.security import AuthenticatedUser
+from app.core.storage import HashingStream, UploadTooLarge, storage
+from app.db.session import get_async_db
+from app.models.assets import Asset
+from app.models.post import Post
+
+router = APIRouter()
+
+
+class AssetUploadResponse(BaseModel):
+    id: str
+    post_id: str
+    file_url: str
+    media_type: str
+    size: int
+    sha256: str
+    # True when identical content was already stored and only a new reference was added.
+    deduplicated: bool = False
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[PostAssetResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+async def _reuse_variants(db: AsyncSession, asset: Asset) -> Optional[List[Asset]]:
+    """Copy the variant rows of an earlier upload of the same content, if any.
+
+    The copies point at the same blobs, so nothing is rendered or stored.
+    """
+    earlier = (await db.execute(
+        select(Asset)
+        .options(selectinload(Asset.variants))
+        .where(
+            Asset.blob_hash == asset.blob_hash,
+            Asset.variant == "original",
+            Asset.id != asset.id,
+        )
+        .limit(1)
+    )).scalars().first()
+    if earlier is None:
+        return None
+
+    asset.width = earlier.width
+    asset.height = earlier.height
+    variants = []
+    for variant in earlier.variants:
+        # Referenced before the copy exists; a variant collected meanwhile is skipped.
+        if variant.blob_hash is not None and await acquire_blob(db, variant.blob_hash) is None:
+            continue
+        variants.append(Asset(
+            post_id=asset.post_id,
+            original=asset,
+            variant=variant.variant,
+            blob_hash=variant.blob_hash,
+            file_url=variant.file_url,
+            media_type=variant.media_type,
+            width=variant.width,
+            height=variant.height,
+        ))
+    return variants
+
+
+@router.post("", response_model=AssetUploadResponse, status_code=201)
+async def upload_asset(
+    request: Request,
+    post_id: uuid.UUID = Query(...),
+    content_type: Optional[str] = Header(default=None),
+    content_length: Optional[int] = Header(default=None),
+    x_content_sha256: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_verified_user),
+):
+    """Upload one file to one of the caller's posts, as the raw request body.
+
+    The body is streamed to storage in UPLOAD_CHUNK_BYTES pieces and hashed
+    on the way through, so memory use doesn't grow with the file. Send the
+    file's type as Content-Type. Stored objects are keyed by content hash,
+    so identical files are kept once. A client that sends X-Content-SHA256
+    (ideally with `Expect: 100-continue`) for content already stored gets
+    its asset without the body ever being read. Images also get resized
+    variants.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if "/" not in media_type or media_type.startswith("multipart/"):
+        raise HTTPException(
+            status_code=415,
+            detail="Send the file as the raw request body with its Content-Type",
+        )
+    if content_length is not None and content_length > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Uploads are limited to {MAX_UPLOAD_BYTES} bytes")
+
+    author_id = (await db.execute(select(Post.author_id).where(Post.id == post_id))).scalar_one_or_none()
+    if author_id is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if author_id != user.id:
+        raise HTTPException(status_code=403, detail="Not the author of this post")
+
+    asset_id = uuid.uuid4()
+    claimed_hash = x_content_sha256.strip().lower() if x_content_sha256 else None
+    blob = await acquire_blob(db, claimed_hash) if claimed_hash else None
+    stored_now = False
+
+    if blob is None:
+        staging_key = f"uploads/{asset_id}"
+        body = HashingStream(request.stream(), UPLOAD_CHUNK_BYTES, MAX_UPLOAD_BYTES)
+        try:
+            await storage.save_stream(staging_key, body, media_type)
+        except UploadTooLarge:
+            raise HTTPException(status_code=413, detail=f"Uploads are limited to {MAX_UPLOAD_BYTES} bytes")
+
+        if body.size == 0:
+            await storage.delete(staging_key)
+            raise HTTPException(status_code=400, detail="Empty upload")
+        if claimed_hash and claimed_hash != body.sha256:
+            await storage.delete(staging_key)
+            raise HTTPException(status_code=400, detail="Checksum mismatch")
+
+        blob = await acquire_blob(db, body.sha256)
+        if blob is not None:
+            await storage.delete(staging_key)
+        else:
+            key = blob_key(body.sha256, media_type)
+            await storage.move(staging_key, key)
+            blob = await store_blob(db, {
+                "hash": body.sha256,
+                "storage_key": key,
+                "size": body.size,
+                "media_type": media_type,
+            })
+            stored_now = blob.storage_key == key
+            if not stored_now:
+                # Stored concurrently under another type's key; keep theirs.
+                await storage.delete(key)
+
+    asset = Asset(
+        id=asset_id,
+        post_id=post_id,
+        blob_hash=blob.hash,
+        file_url=storage.url_for(blob.storage_key),
+        media_type=blob.media_type,
+    )
+    variants = await _reuse_variants(db, asset)
+    source = storage.local_path(blob.storage_key)
+    if variants is None and blob.media_type.startswith("image/") and source is not None:
+        try:
+            # The worker reads the stored file itself; the bytes never come back here.
+            variants = await create_variant_assets(db, asset, str(source))
+        except (UnidentifiedImageError, OSError) as exc:
+            print(f"Error rendering variants for asset {asset_id}: {exc}")
+            if stored_now:
+                await storage.delete(blob.storage_key)
+            raise HTTPException(status_code=400, detail="Unreadable image")
+
+    db.add(asset)
+    db.add_all(variants or [])
+    await db.commit()
+
+    return AssetUploadResponse(
+        id=str(asset.id),
+        post_id=str(post_id),
+        file_url=asset.file_url,
+        media_type=asset.media_type,
+        size=blob.size,
+        sha256=blob.hash,
+        deduplicated=not stored_now,
+        width=asset.width,
+        height=asset.height,
+        variants=[
+            PostAssetResponse(
+                file_url=variant.file_url,
+                media_type=variant.media_type,
+                width=variant.width,
+                height=variant.height,
+            )
+            for variant in variants or []
+        ],
+    )
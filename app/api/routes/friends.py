@@ -0,0 +1,157 @@
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy import desc, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+from app.api.routes.homepage import AuthorSummary
+from app.core.deps import get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import AuthenticatedUser
+from app.db.session import get_async_db
+from app.models.friendship import Friendship, FriendshipStatus
+from app.models.user import User
+
+router = APIRouter()
+
+
+class FriendshipEntry(BaseModel):
+    friendship_id: str
+    user: AuthorSummary
+    created_at: datetime
+
+
+class FriendshipPage(BaseModel):
+    items: List[FriendshipEntry]
+    next_cursor: Optional[str] = None
+
+
+def _side(
+    own_column,
+    other_column,
+    user_id: uuid.UUID,
+    status: FriendshipStatus,
+    limit: int,
+    after: Optional[tuple[datetime, uuid.UUID]],
+    *criteria,
+):
+    """One direction of the user's friendships, newest first, as a subquery.
+
+    `<side>_id = ? AND status = ?` is an equality prefix of the
+    (<side>_id, status, created_at) index, so this is a single ordered range
+    scan that stops after `limit` rows. `criteria` filter it further.
+    """
+    query = select(
+        Friendship.id,
+        Friendship.created_at,
+        other_column.label("user_id"),
+    ).where(own_column == user_id, Friendship.status == status, *criteria)
+    if after is not None:
+        query = query.where(tuple_(Friendship.created_at, Friendship.id) < after)
+    return (
+        query
+        .order_by(desc(Friendship.created_at), desc(Friendship.id))
+        .limit(limit)
+        .subquery()
+    )
+
+
+async def _fetch_page(db: AsyncSession, edges, limit: int) -> FriendshipPage:
+    """Join a `limit + 1` page of edges to the other users and derive the next cursor."""
+    rows = (await db.execute(
+        select(
+            edges.c.id,
+            edges.c.created_at,
+            User.id.label("other_id"),
+            User.username,
+            User.real_name,
+            User.avatar_url,
+        )
+        .join(User, User.id == edges.c.user_id)
+        .order_by(desc(edges.c.created_at), desc(edges.c.id))
+        .limit(limit + 1)
+    )).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    items = [
+        FriendshipEntry(
+            friendship_id=str(row.id),
+            user=AuthorSummary(
+                id=str(row.other_id),
+                username=row.username,
+                real_name=row.real_name,
+                avatar_url=row.avatar_url,
+            ),
+            created_at=row.created_at,
+        )
+        for row in rows
+    ]
+    return FriendshipPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("", response_model=FriendshipPage)
+async def list_friends(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> FriendshipPage:
+    """The caller's accepted friends, most recent friendship first."""
+    after = decode_cursor(cursor)
+    # Rows in both directions can exist for one pair; list such a friend once,
+    # under the caller's own row. The check is a probe of unique_friendship.
+    mirrored = aliased(Friendship)
+    sent_too = (
+        select(mirrored.id)
+        .where(
+            mirrored.requester_id == user.id,
+            mirrored.addressee_id == Friendship.requester_id,
+            mirrored.status == FriendshipStatus.ACCEPTED,
+        )
+        .exists()
+    )
+    # Each direction is its own index range scan; only 2 * (limit + 1) rows are merged.
+    sent = _side(Friendship.requester_id, Friendship.addressee_id, user.id, FriendshipStatus.ACCEPTED, limit + 1, after)
+    received = _side(
+        Friendship.addressee_id, Friendship.requester_id, user.id,
+        FriendshipStatus.ACCEPTED, limit + 1, after, ~sent_too,
+    )
+    edges = union_all(select(sent), select(received)).subquery()
+    return await _fetch_page(db, edges, limit)
+
+
+@router.get("/requests", response_model=FriendshipPage)
+async def list_incoming_requests(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> FriendshipPage:
+    """Pending requests sent to the caller, newest first."""
+    edges = _side(
+        Friendship.addressee_id, Friendship.requester_id, user.id,
+        FriendshipStatus.PENDING, limit + 1, decode_cursor(cursor),
+    )
+    return await _fetch_page(db, edges, limit)
+
+
+@router.get("/requests/sent", response_model=FriendshipPage)
+async def list_outgoing_requests(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> FriendshipPage:
+    """Pending requests the caller has sent, newest first."""
+    edges = _side(
+        Friendship.requester_id, Friendship.addressee_id, user.id,
+        FriendshipStatus.PENDING, limit + 1, decode_cursor(cursor),
+    )
+    return await _fetch_page(db, edges, limit)
@@ -1,22 +1,53 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Header, Response
 from pydantic import BaseModel
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select, tuple_, union
+from datetime import datetime
+import uuid
 
-from app.db.session import get_db
+from app.core.deps import get_current_user
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.core.feed_cache import feed_cache, feed_version
+from app.core.images import pick_variant
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.quiz_stats import QuizStats, get_quiz_stats
+from app.core.ranking import popularity_index
+from app.core.security import AuthenticatedUser
+from app.core.serialization import dumps, json_response
+from app.core.view_counter import view_counter
+from app.db.session import get_async_db
+from app.models.assets import Asset
+from app.models.friendship import Friendship, FriendshipStatus
 from app.models.post import Post
+from app.models.user import User
 
 router = APIRouter()
 
 
+class AuthorSummary(BaseModel):
+    id: str
+    username: str
+    real_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+
+class PostAssetResponse(BaseModel):
+    file_url: str
+    media_type: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
 class HomepagePostResponse(BaseModel):
     id: str
     title: str
     description: Optional[str] = None
     created_at: str
     author: Optional[str] = None
+    author_summary: Optional[AuthorSummary] = None
     image_url: Optional[str] = None
+    assets: List[PostAssetResponse] = []
 
     class Config:
         from_attributes = True
@@ -28,93 +59,320 @@ class HomepageStats(BaseModel):
     draft_quizzes: int
 
 
-class HomepageResponse(BaseModel):
-    title: str
-    description: str
-    status: str
-    stats: HomepageStats
-    featured_sections: List[str]
-
-
 class HomepageFeedResponse(BaseModel):
     status: str
     latest_post: Optional[HomepagePostResponse]
     popular_posts: List[HomepagePostResponse]
 
 
-def _fetch_published_posts(
-    db: Session,
+class HomepagePostPage(BaseModel):
+    items: List[HomepagePostResponse]
+    next_cursor: Optional[str] = None
+
+
+# Only the columns the feed renders; Post.content is never read on this path.
+_FEED_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.excerpt,
+    Post.created_at,
+    Post.author_id,
+    Post.image_url,
+)
+
+
+def _to_page(posts: List[HomepagePostResponse], limit: int) -> HomepagePostPage:
+    """Trim a `limit + 1` fetch to one page and derive the next cursor."""
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        last = posts[-1]
+        next_cursor = encode_cursor(datetime.fromisoformat(last.created_at), uuid.UUID(last.id))
+    return HomepagePostPage(items=posts, next_cursor=next_cursor)
+
+
+def _to_post_response(row) -> HomepagePostResponse:
+    return HomepagePostResponse(
+        id=str(row.id),
+        title=row.title,
+        description=row.excerpt,
+        created_at=row.created_at.isoformat(),
+        author=str(row.author_id) if row.author_id else None,
+        image_url=row.image_url,
+    )
+
+
+async def _fetch_published_posts(
+    db: AsyncSession,
     limit: int,
+    after: Optional[tuple[datetime, uuid.UUID]] = None,
+    author_ids=None,
 ) -> List[HomepagePostResponse]:
-    """Fetch published posts using SQLAlchemy."""
+    """Fetch published posts newest first, starting after the `after` key.
+
+    `author_ids` optionally restricts the feed to a set of authors (a list or
+    a subquery selecting user ids).
+    """
     try:
-        posts = (
-            db.query(Post)
-            .filter(Post.is_published == True)
-            .order_by(desc(Post.created_at))
+        query = select(*_FEED_COLUMNS).where(Post.is_published == True)
+        if author_ids is not None:
+            query = query.where(Post.author_id.in_(author_ids))
+        if after is not None:
+            # Row-value comparison keeps this a single range scan on ix_posts_feed.
+            query = query.where(tuple_(Post.created_at, Post.id) < after)
+
+        # Plain rows, not entities: no identity map or unit-of-work bookkeeping.
+        rows = (await db.execute(
+            query
+            .order_by(desc(Post.created_at), desc(Post.id))
             .limit(limit)
-            .all()
+        )).all()
+
+        return [_to_post_response(row) for row in rows]
+    except Exception as exc:
+        print(f"Error fetching posts: {exc}")
+        return []
+
+
+async def _attach_authors(
+    db: AsyncSession,
+    posts: List[HomepagePostResponse],
+) -> None:
+    """Fill `author_summary` with one batched lookup over the distinct authors."""
+    author_ids = {uuid.UUID(post.author) for post in posts if post.author}
+    if not author_ids:
+        return
+
+    try:
+        rows = (await db.execute(
+            select(User.id, User.username, User.real_name, User.avatar_url)
+            .where(User.id.in_(author_ids))
+        )).all()
+    except Exception as exc:
+        print(f"Error fetching post authors: {exc}")
+        return
+
+    # One summary object per author, shared by all of that author's posts.
+    summaries = {
+        str(row.id): AuthorSummary(
+            id=str(row.id),
+            username=row.username,
+            real_name=row.real_name,
+            avatar_url=row.avatar_url,
         )
-        
-        return [
-            HomepagePostResponse(
-                id=str(post.id),
-                title=post.title,
-                description=post.excerpt,
-                created_at=post.created_at.isoformat(),
-                author=str(post.author_id) if post.author_id else None,
-                image_url=post.image_url,
+        for row in rows
+    }
+    for post in posts:
+        post.author_summary = summaries.get(post.author)
+
+
+def collapse_asset_variants(assets, width: Optional[int]) -> List[PostAssetResponse]:
+    """One entry per original image, using the variant that best fits `width`."""
+    families: dict = {}
+    for asset in assets:
+        families.setdefault(asset.original_id or asset.id, []).append(asset)
+
+    chosen = [pick_variant(family, width) for family in families.values()]
+    return [
+        PostAssetResponse(
+            file_url=asset.file_url,
+            media_type=asset.media_type,
+            width=asset.width,
+            height=asset.height,
+        )
+        for asset in chosen
+    ]
+
+
+async def _attach_assets(
+    db: AsyncSession,
+    posts: List[HomepagePostResponse],
+    width: Optional[int] = None,
+) -> None:
+    """Fill `assets` for a whole page with one query, like selectinload."""
+    if not posts:
+        return
+
+    try:
+        # Ordered straight off ix_assets_post_created; no sort step.
+        rows = (await db.execute(
+            select(
+                Asset.id,
+                Asset.post_id,
+                Asset.original_id,
+                Asset.variant,
+                Asset.file_url,
+                Asset.media_type,
+                Asset.width,
+                Asset.height,
             )
-            for post in posts
-        ]
+            .where(Asset.post_id.in_([uuid.UUID(post.id) for post in posts]))
+            .order_by(Asset.post_id, Asset.created_at)
+        )).all()
+    except Exception as exc:
+        print(f"Error fetching post assets: {exc}")
+        return
+
+    by_post: dict[str, list] = {}
+    for row in rows:
+        by_post.setdefault(str(row.post_id), []).append(row)
+    for post in posts:
+        post.assets = collapse_asset_variants(by_post.get(post.id, []), width)
+
+
+async def _fetch_posts_by_ids(
+    db: AsyncSession,
+    post_ids: List[uuid.UUID],
+) -> List[HomepagePostResponse]:
+    """Fetch the given published posts, preserving the order of `post_ids`."""
+    if not post_ids:
+        return []
+
+    try:
+        rows = (await db.execute(
+            select(*_FEED_COLUMNS)
+            .where(Post.id.in_(post_ids), Post.is_published == True)
+        )).all()
     except Exception as exc:
         print(f"Error fetching posts: {exc}")
         return []
 
+    by_id = {row.id: _to_post_response(row) for row in rows}
+    return [by_id[post_id] for post_id in post_ids if post_id in by_id]
 
-def _build_homepage_payload() -> HomepageResponse:
-    return HomepageResponse(
-        title="Dadarzz FIKSI",
-        description="Prototype.",
-        status="ok",
-        stats=HomepageStats(
-            total_quizzes=0,
-            published_quizzes=0,
-            draft_quizzes=0,
+
+def _accepted_friend_ids(user_id: uuid.UUID):
+    """Subquery of the user's ACCEPTED friends, read from both edge directions.
+
+    Each branch is an equality prefix of a (<side>_id, status, created_at)
+    index, so the friend set is resolved inside the posts query rather than
+    per friend.
+    """
+    return union(
+        select(Friendship.addressee_id).where(
+            Friendship.status == FriendshipStatus.ACCEPTED,
+            Friendship.requester_id == user_id,
         ),
-        featured_sections=[
-            "Latest Quizzes",
-            "Trending Topics",
-            "Your Drafts",
-        ],
+        select(Friendship.requester_id).where(
+            Friendship.status == FriendshipStatus.ACCEPTED,
+            Friendship.addressee_id == user_id,
+        ),
+    ).subquery()
+
+
+def _to_homepage_stats(stats: QuizStats) -> HomepageStats:
+    return HomepageStats(
+        total_quizzes=stats.total,
+        published_quizzes=stats.published,
+        draft_quizzes=stats.drafts,
     )
 
 
 @router.get("/health")
-def homepage_health() -> dict[str, str]:
+async def homepage_health() -> dict[str, str]:
     return {"status": "homepage router ready"}
 
 
+@router.get("/stats", response_model=HomepageStats)
+async def get_homepage_stats(db: AsyncSession = Depends(get_async_db)) -> HomepageStats:
+    """Quiz totals from the running counters; no scan of `quizzes`."""
+    return _to_homepage_stats(await get_quiz_stats(db))
+
+
 @router.get("/", response_model=HomepageFeedResponse)
-def get_homepage(
+async def get_homepage(
     popular_limit: int = Query(default=5, ge=1, le=20),
-    db: Session = Depends(get_db),
-) -> HomepageFeedResponse:
-    posts = _fetch_published_posts(db=db, limit=max(popular_limit, 1) + 1)
-    latest_post = posts[0] if posts else None
-    popular_posts = posts[1 : popular_limit + 1] if posts else []
+    width: Optional[int] = Query(default=None, ge=16, le=4096),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    cache_key = ("homepage", popular_limit, width)
+    cached = feed_cache.get(cache_key)
+    if cached is not None:
+        etag, body, shown_ids = cached
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        view_counter.record_impressions(shown_ids)
+        return json_response(body, etag)
+
+    generation = feed_cache.generation
+    popular_ids = popularity_index.top(popular_limit + 1)
+    etag = make_etag("homepage", popular_limit, width, await feed_version(db), *popular_ids)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    latest = await _fetch_published_posts(db=db, limit=1)
+    latest_post = latest[0] if latest else None
+
+    # Ranked ids come precomputed from the popularity index; only rows are fetched.
+    if latest_post is not None:
+        popular_ids = [post_id for post_id in popular_ids if str(post_id) != latest_post.id]
+    popular_posts = await _fetch_posts_by_ids(db=db, post_ids=popular_ids[:popular_limit])
+    await _attach_authors(db=db, posts=latest + popular_posts)
+    await _attach_assets(db=db, posts=latest + popular_posts, width=width)
 
-    return HomepageFeedResponse(
+    payload = HomepageFeedResponse(
         status="ok",
         latest_post=latest_post,
         popular_posts=popular_posts,
     )
+    # Encoded once here; cache hits return these bytes without re-validation.
+    body = dumps(payload)
+    shown_ids = [uuid.UUID(post.id) for post in latest + popular_posts]
+    feed_cache.set(cache_key, (etag, body, shown_ids), generation=generation)
+    view_counter.record_impressions(shown_ids)
+    return json_response(body, etag)
 
 
-@router.get("/posts", response_model=List[HomepagePostResponse])
-def get_homepage_posts(
+@router.get("/posts", response_model=HomepagePostPage)
+async def get_homepage_posts(
     limit: int = Query(default=10, ge=1, le=50),
-    db: Session = Depends(get_db),
-) -> List[HomepagePostResponse]:
-    """Get all published posts."""
-    return _fetch_published_posts(db=db, limit=limit)
\ No newline at end of file
+    cursor: Optional[str] = Query(default=None),
+    width: Optional[int] = Query(default=None, ge=16, le=4096),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Get published posts, one keyset page at a time."""
+    after = decode_cursor(cursor)
+    cache_key = ("posts", limit, cursor, width)
+    cached = feed_cache.get(cache_key)
+    if cached is not None:
+        etag, body = cached
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return json_response(body, etag)
+
+    generation = feed_cache.generation
+    etag = make_etag("posts", limit, cursor, width, await feed_version(db))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    page = _to_page(await _fetch_published_posts(db=db, limit=limit + 1, after=after), limit)
+    await _attach_authors(db=db, posts=page.items)
+    await _attach_assets(db=db, posts=page.items, width=width)
+
+    body = dumps(page)
+    feed_cache.set(cache_key, (etag, body), generation=generation)
+    return json_response(body, etag)
+
+
+@router.get("/friends", response_model=HomepagePostPage)
+async def get_friends_feed(
+    limit: int = Query(default=10, ge=1, le=50),
+    cursor: Optional[str] = Query(default=None),
+    width: Optional[int] = Query(default=None, ge=16, le=4096),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> HomepagePostPage:
+    """Get published posts from the caller's accepted friends, newest first."""
+    friend_ids = _accepted_friend_ids(user.id)
+    posts = await _fetch_published_posts(
+        db=db,
+        limit=limit + 1,
+        after=decode_cursor(cursor),
+        author_ids=select(friend_ids.c[0]),
+    )
+    page = _to_page(posts, limit)
+    await _attach_authors(db=db, posts=page.items)
+    await _attach_assets(db=db, posts=page.items, width=width)
+    return page
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+from app.api.routes.homepage import PostAssetResponse, collapse_asset_variants
+from app.core.search import search_backend
+from app.core.view_counter import view_counter
+from app.db.session import get_async_db
+from app.models.post import Post
+
+router = APIRouter()
+
+
+class PostDetailResponse(BaseModel):
+    id: str
+    title: str
+    content: str
+    description: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    author: Optional[str] = None
+    image_url: Optional[str] = None
+    view_count: int
+    like_count: int
+    assets: List[PostAssetResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class PostSearchHit(BaseModel):
+    id: str
+    title: str
+    description: Optional[str] = None
+    created_at: datetime
+    author: Optional[str] = None
+    image_url: Optional[str] = None
+    rank: float
+
+
+@router.get("/search", response_model=List[PostSearchHit])
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Search published posts by title, excerpt and content, best match first."""
+    if not q.strip():
+        return []
+
+    rows = (await db.execute(search_backend.search_statement(q, limit))).all()
+    return [
+        PostSearchHit(
+            id=str(row.id),
+            title=row.title,
+            description=row.excerpt,
+            created_at=row.created_at,
+            author=str(row.author_id) if row.author_id else None,
+            image_url=row.image_url,
+            rank=row.rank,
+        )
+        for row in rows
+    ]
+
+
+@router.get("/{post_id}", response_model=PostDetailResponse)
+async def get_post(
+    post_id: uuid.UUID,
+    width: Optional[int] = Query(default=None, ge=16, le=4096),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a single published post."""
+    post = (await db.execute(
+        select(Post)
+        .options(selectinload(Post.assets))
+        .where(Post.id == post_id, Post.is_published == True)
+    )).scalars().first()
+
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    view_counter.record(post.id)
+
+    return PostDetailResponse(
+        id=str(post.id),
+        title=post.title,
+        content=post.content,
+        description=post.excerpt,
+        created_at=post.created_at,
+        updated_at=post.updated_at,
+        author=str(post.author_id) if post.author_id else None,
+        image_url=post.image_url,
+        view_count=post.view_count,
+        like_count=post.like_count,
+        assets=collapse_asset_variants(post.assets, width),
+    )
@@ -1,10 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
 from datetime import datetime
+import uuid
 
-from app.db.session import get_db
+from app.core.autocomplete import autocomplete_backend
+from app.core.deps import get_current_user
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.core.friend_graph import friend_graph
+from app.core.profile_cache import (
+    CachedProfile,
+    cache_generation,
+    cache_miss,
+    cache_profile,
+    get_cached_profile,
+    is_known_missing,
+)
+from app.core.security import AuthenticatedUser
+from app.core.serialization import dumps, json_response
+from app.db.session import get_async_db
+from app.models.friendship import Friendship, FriendshipStatus
 from app.models.user import User
 
 router = APIRouter()
@@ -23,13 +40,71 @@ class ShowProfile(BaseModel):
         from_attributes = True
 
 
-@router.get("/{username}", response_model=ShowProfile)
-def get_profile(username: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == username).first()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
+class ProfileSuggestion(BaseModel):
+    id: str
+    username: str
+    real_name: Optional[str]
+    avatar_url: Optional[str]
+
+
+class FriendSuggestion(ProfileSuggestion):
+    mutual_count: int
+
+
+class MutualFriendsResponse(BaseModel):
+    count: int
+    friends: List[ProfileSuggestion]
+
+
+def _to_suggestion(user) -> ProfileSuggestion:
+    return ProfileSuggestion(
+        id=str(user.id),
+        username=user.username,
+        real_name=user.real_name,
+        avatar_url=user.avatar_url,
+    )
+
+
+@router.get("/search", response_model=List[ProfileSuggestion])
+async def search_profiles(
+    prefix: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(default=8, ge=1, le=25),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Autocomplete users by username / real name prefix, with fuzzy fallback."""
+    entries = await autocomplete_backend.suggest(db, prefix, limit)
+    return [
+        ProfileSuggestion(
+            id=str(entry.id),
+            username=entry.username,
+            real_name=entry.real_name,
+            avatar_url=entry.avatar_url,
+        )
+        for entry in entries
+    ]
+
+
+MAX_BATCH_LOOKUPS = 300
+
+
+class ProfileBatchRequest(BaseModel):
+    ids: List[uuid.UUID] = Field(default_factory=list)
+    usernames: List[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _check_size(self):
+        if len(self.ids) + len(self.usernames) > MAX_BATCH_LOOKUPS:
+            raise ValueError(f"At most {MAX_BATCH_LOOKUPS} ids and usernames per request")
+        return self
+
+
+class ProfileBatchResponse(BaseModel):
+    profiles: Dict[str, ShowProfile]
+    missing_ids: List[str]
+    missing_usernames: List[str]
+
+
+def _to_profile(user) -> ShowProfile:
     return ShowProfile(
         id=str(user.id),
         real_name=user.real_name,
@@ -41,20 +116,191 @@ def get_profile(username: str, db: Session = Depends(get_db)):
     )
 
 
-@router.get("/id/{user_id}", response_model=ShowProfile)
-def get_profile_by_id(user_id: str, db: Session = Depends(get_db)):
-    """Get user profile by user ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+def _to_cache_entry(user) -> CachedProfile:
+    profile = _to_profile(user)
+    return CachedProfile(
+        etag=make_etag("profile", user.id, user.updated_at),
+        body=dumps(profile),
+        profile=profile,
+    )
+
+
+async def _serve_profile(
+    db: AsyncSession,
+    cache_key: tuple,
+    condition,
+    if_none_match: Optional[str],
+):
+    """Serve one profile from cache, a 304 revalidation, or a single SELECT."""
+    cached = get_cached_profile(cache_key)
+    if cached is not None:
+        if etag_matches(if_none_match, cached.etag):
+            return not_modified(cached.etag)
+        return json_response(cached.body, cached.etag)
+
+    if is_known_missing(cache_key):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    generation = cache_generation()
+    if if_none_match:
+        # Revalidation only needs (id, updated_at) off the lookup index.
+        version = (await db.execute(select(User.id, User.updated_at).where(condition))).first()
+        if version is not None:
+            etag = make_etag("profile", *version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    user = (await db.execute(select(User).where(condition))).scalars().first()
     
     if not user:
+        cache_miss(cache_key, generation)
         raise HTTPException(status_code=404, detail="User not found")
     
-    return ShowProfile(
-        id=str(user.id),
-        real_name=user.real_name,
-        username=user.username,
-        avatar_url=user.avatar_url,
-        bio=user.bio,
-        is_active=user.is_active,
-        created_at=user.created_at,
-    )
\ No newline at end of file
+    entry = _to_cache_entry(user)
+    cache_profile(entry, user.id, user.username, generation)
+    return json_response(entry.body, entry.etag)
+
+
+@router.get("/me/suggestions", response_model=List[FriendSuggestion])
+async def get_friend_suggestions(
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> List[FriendSuggestion]:
+    """People you may know: friends of friends, ranked by mutual friends."""
+    # Anyone with a pending, rejected or blocked request either way is left out.
+    related = (await db.execute(
+        select(Friendship.requester_id, Friendship.addressee_id).where(
+            Friendship.status != FriendshipStatus.ACCEPTED,
+            or_(Friendship.requester_id == user.id, Friendship.addressee_id == user.id),
+        )
+    )).all()
+    exclude = {other for pair in related for other in pair if other != user.id}
+
+    # Over-fetch a little so dropping inactive accounts still fills the page.
+    ranked = friend_graph.suggestions(user.id, limit * 2, exclude=exclude)
+    if not ranked:
+        return []
+
+    users = (await db.execute(
+        select(User.id, User.username, User.real_name, User.avatar_url)
+        .where(User.id.in_([candidate for candidate, _ in ranked]), User.is_active == True)
+    )).all()
+    by_id = {row.id: row for row in users}
+
+    suggestions = []
+    for candidate, mutual_count in ranked:
+        row = by_id.get(candidate)
+        if row is None:
+            continue
+        suggestions.append(FriendSuggestion(
+            **_to_suggestion(row).model_dump(),
+            mutual_count=mutual_count,
+        ))
+        if len(suggestions) == limit:
+            break
+    return suggestions
+
+
+@router.get("/{username}/mutuals", response_model=MutualFriendsResponse)
+async def get_mutual_friends(
+    username: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> MutualFriendsResponse:
+    """Friends the caller shares with `username`: the total, plus a page by username."""
+    other_id = (await db.execute(select(User.id).where(User.username == username))).scalar_one_or_none()
+    if other_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    mutual_ids = friend_graph.mutuals(user.id, other_id)
+    if not mutual_ids:
+        return MutualFriendsResponse(count=0, friends=[])
+
+    users = (await db.execute(
+        select(User.id, User.username, User.real_name, User.avatar_url)
+        .where(User.id.in_(mutual_ids))
+        .order_by(User.username)
+        .limit(limit)
+    )).all()
+    return MutualFriendsResponse(
+        count=len(mutual_ids),
+        friends=[_to_suggestion(row) for row in users],
+    )
+
+
+@router.get("/{username}", response_model=ShowProfile)
+async def get_profile(
+    username: str,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _serve_profile(db, ("username", username), User.username == username, if_none_match)
+
+
+@router.get("/id/{user_id}", response_model=ShowProfile)
+async def get_profile_by_id(
+    user_id: uuid.UUID,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get user profile by user ID."""
+    return await _serve_profile(db, ("id", user_id), User.id == user_id, if_none_match)
+
+
+@router.post("/batch", response_model=ProfileBatchResponse)
+async def get_profiles_batch(
+    request: ProfileBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> ProfileBatchResponse:
+    """Resolve many ids/usernames at once: cache first, then one IN (...) query."""
+    profiles: Dict[str, ShowProfile] = {}
+    missing_ids: List[str] = []
+    missing_usernames: List[str] = []
+    pending_ids: set[uuid.UUID] = set()
+    pending_usernames: set[str] = set()
+
+    for user_id in request.ids:
+        cached = get_cached_profile(("id", user_id))
+        if cached is not None:
+            profiles[cached.profile.id] = cached.profile
+        elif is_known_missing(("id", user_id)):
+            missing_ids.append(str(user_id))
+        else:
+            pending_ids.add(user_id)
+
+    for username in request.usernames:
+        cached = get_cached_profile(("username", username))
+        if cached is not None:
+            profiles[cached.profile.id] = cached.profile
+        elif is_known_missing(("username", username)):
+            missing_usernames.append(username)
+        else:
+            pending_usernames.add(username)
+
+    if pending_ids or pending_usernames:
+        generation = cache_generation()
+        users = (await db.execute(
+            select(User).where(or_(User.id.in_(pending_ids), User.username.in_(pending_usernames)))
+        )).scalars().all()
+
+        for user in users:
+            entry = _to_cache_entry(user)
+            profiles[entry.profile.id] = entry.profile
+            cache_profile(entry, user.id, user.username, generation)
+            pending_ids.discard(user.id)
+            pending_usernames.discard(user.username)
+
+        for user_id in pending_ids:
+            cache_miss(("id", user_id), generation)
+            missing_ids.append(str(user_id))
+        for username in pending_usernames:
+            cache_miss(("username", username), generation)
+            missing_usernames.append(username)
+
+    return ProfileBatchResponse(
+        profiles=profiles,
+        missing_ids=missing_ids,
+        missing_usernames=missing_usernames,
+    )
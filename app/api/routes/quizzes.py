@@ -0,0 +1,373 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+import random
+import uuid
+
+from app.api.routes.homepage import AuthorSummary
+from app.core.deps import get_current_user
+from app.core.grading import (
+    UNANSWERED,
+    answer_matrix,
+    build_answer_key,
+    count_attempts,
+    grade,
+    regrade_quiz,
+)
+from app.core.leaderboard import leaderboards, refresh_quiz_leaderboard
+from app.core.security import AuthenticatedUser
+from app.db.session import get_async_db
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.quiz_question import QuizQuestion
+from app.models.user import User
+
+router = APIRouter()
+
+
+class QuizQuestionResponse(BaseModel):
+    id: str
+    position: int
+    prompt: str
+    choices: List[str]
+    points: int
+
+
+class QuizDetailResponse(BaseModel):
+    id: str
+    title: str
+    description: Optional[str]
+    passing_score: int
+    attempts_allowed: int
+    show_answers: bool
+    questions: List[QuizQuestionResponse]
+
+
+class AttemptStartResponse(BaseModel):
+    id: str
+    attempt_number: int
+    # -1 when attempts are unlimited.
+    attempts_remaining: int
+    started_at: datetime
+    questions: List[QuizQuestionResponse]
+
+
+class AnswerSubmission(BaseModel):
+    question_id: uuid.UUID
+    choice: int = Field(..., ge=UNANSWERED)
+
+
+class AttemptSubmission(BaseModel):
+    answers: List[AnswerSubmission]
+
+
+class QuestionResult(BaseModel):
+    question_id: str
+    choice: int
+    is_correct: bool
+    correct_choice: Optional[int] = None
+
+
+class AttemptResultResponse(BaseModel):
+    id: str
+    points: int
+    total_points: int
+    score: float
+    passed: bool
+    finished_at: datetime
+    time_used_seconds: int
+    # Per-question results; only when the quiz shows answers.
+    results: Optional[List[QuestionResult]] = None
+
+
+class QuestionKeyUpdate(BaseModel):
+    correct_choice: Optional[int] = Field(default=None, ge=0)
+    points: Optional[int] = Field(default=None, ge=0)
+
+
+class QuestionKeyUpdateResponse(BaseModel):
+    question_id: str
+    correct_choice: int
+    points: int
+    # Finished attempts re-scored against the corrected key.
+    regraded_attempts: int
+
+
+class LeaderboardRow(BaseModel):
+    rank: int
+    user: Optional[AuthorSummary]
+    score: float
+    time_used_seconds: int
+
+
+class LeaderboardStanding(BaseModel):
+    rank: int
+    percentile: float
+    score: float
+    time_used_seconds: int
+
+
+class LeaderboardResponse(BaseModel):
+    total: int
+    top: List[LeaderboardRow]
+    # The caller's own standing; None until they have a graded attempt.
+    me: Optional[LeaderboardStanding] = None
+
+
+def _is_attempt_number_conflict(exc: IntegrityError) -> bool:
+    """Whether `exc` is the (quiz, user, attempt_number) unique violation."""
+    constraint = getattr(getattr(exc.orig, "diag", None), "constraint_name", None)
+    if constraint is not None:
+        return constraint == "unique_quiz_attempt_number"
+    # SQLite names the columns rather than the constraint.
+    return "quiz_attempts.attempt_number" in str(exc.orig)
+
+
+def _to_question(question) -> QuizQuestionResponse:
+    return QuizQuestionResponse(
+        id=str(question.id),
+        position=question.position,
+        prompt=question.prompt,
+        choices=question.choices,
+        points=question.points,
+    )
+
+
+async def _get_quiz(db: AsyncSession, quiz_id: uuid.UUID, user: AuthenticatedUser) -> Quiz:
+    """The quiz, if the caller may see it: public quizzes, or their own."""
+    quiz = await db.get(Quiz, quiz_id)
+    if quiz is None or not (quiz.is_public or quiz.author_id == user.id):
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    return quiz
+
+
+async def _get_questions(db: AsyncSession, quiz_id: uuid.UUID) -> List[QuizQuestion]:
+    return list((await db.execute(
+        select(QuizQuestion)
+        .where(QuizQuestion.quiz_id == quiz_id)
+        .order_by(QuizQuestion.position)
+    )).scalars())
+
+
+@router.get("/{quiz_id}", response_model=QuizDetailResponse)
+async def get_quiz(
+    quiz_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> QuizDetailResponse:
+    """Quiz settings and questions, without the answer key."""
+    quiz = await _get_quiz(db, quiz_id, user)
+    questions = await _get_questions(db, quiz.id)
+    return QuizDetailResponse(
+        id=str(quiz.id),
+        title=quiz.title,
+        description=quiz.description,
+        passing_score=quiz.passing_score,
+        attempts_allowed=quiz.attempts_allowed,
+        show_answers=quiz.show_answers,
+        questions=[_to_question(question) for question in questions],
+    )
+
+
+@router.post("/{quiz_id}/attempts", response_model=AttemptStartResponse, status_code=201)
+async def start_attempt(
+    quiz_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> AttemptStartResponse:
+    """Start a new attempt, if the caller has any left."""
+    quiz = await _get_quiz(db, quiz_id, user)
+
+    # One indexed count; prior attempts are never loaded.
+    used = await count_attempts(db, quiz.id, user.id)
+    if quiz.attempts_allowed >= 0 and used >= quiz.attempts_allowed:
+        raise HTTPException(status_code=403, detail="No attempts left for this quiz")
+
+    questions = await _get_questions(db, quiz.id)
+    if not questions:
+        raise HTTPException(status_code=409, detail="Quiz has no questions")
+
+    attempt = QuizAttempt(quiz_id=quiz.id, user_id=user.id, attempt_number=used + 1)
+    db.add(attempt)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not _is_attempt_number_conflict(exc):
+            raise
+        # A concurrent start took this attempt number first.
+        raise HTTPException(status_code=409, detail="Another attempt was started at the same time")
+
+    if quiz.randomize_questions:
+        random.shuffle(questions)
+    remaining = quiz.attempts_allowed - attempt.attempt_number if quiz.attempts_allowed >= 0 else -1
+    return AttemptStartResponse(
+        id=str(attempt.id),
+        attempt_number=attempt.attempt_number,
+        attempts_remaining=remaining,
+        started_at=attempt.started_at,
+        questions=[_to_question(question) for question in questions],
+    )
+
+
+@router.post("/{quiz_id}/attempts/{attempt_id}/submit", response_model=AttemptResultResponse)
+async def submit_attempt(
+    quiz_id: uuid.UUID,
+    attempt_id: uuid.UUID,
+    submission: AttemptSubmission,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> AttemptResultResponse:
+    """Grade and close an attempt. Unanswered questions score nothing."""
+    quiz = await _get_quiz(db, quiz_id, user)
+    attempt = await db.get(QuizAttempt, attempt_id)
+    if attempt is None or attempt.quiz_id != quiz.id or attempt.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    if attempt.finished_at is not None:
+        raise HTTPException(status_code=409, detail="Attempt already submitted")
+
+    questions = await _get_questions(db, quiz.id)
+    columns = {question.id: index for index, question in enumerate(questions)}
+    answers = [UNANSWERED] * len(questions)
+    for answer in submission.answers:
+        column = columns.get(answer.question_id)
+        if column is None:
+            raise HTTPException(status_code=422, detail=f"Unknown question {answer.question_id}")
+        if answer.choice >= len(questions[column].choices):
+            raise HTTPException(status_code=422, detail=f"Invalid choice for question {answer.question_id}")
+        answers[column] = answer.choice
+
+    key = build_answer_key(questions)
+    grades = grade(answer_matrix([answers], len(questions)), key, quiz.passing_score)
+
+    # Close the attempt only if it is still open, so concurrent submits can't both grade it.
+    finished_at = datetime.utcnow()
+    closed = await db.execute(
+        update(QuizAttempt)
+        .where(QuizAttempt.id == attempt.id, QuizAttempt.finished_at.is_(None))
+        .values(finished_at=finished_at)
+    )
+    if closed.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Attempt already submitted")
+
+    attempt.answers = answers
+    attempt.points = int(grades.points[0])
+    attempt.score = float(grades.score[0])
+    attempt.passed = bool(grades.passed[0])
+    attempt.time_used_seconds = int((finished_at - attempt.started_at).total_seconds())
+    await db.commit()
+
+    results = None
+    if quiz.show_answers:
+        results = [
+            QuestionResult(
+                question_id=str(question.id),
+                choice=choice,
+                is_correct=is_correct,
+                correct_choice=question.correct_choice,
+            )
+            for question, choice, is_correct in zip(questions, answers, grades.correct[0].tolist())
+        ]
+    return AttemptResultResponse(
+        id=str(attempt.id),
+        points=attempt.points,
+        total_points=key.total_points,
+        score=attempt.score,
+        passed=attempt.passed,
+        finished_at=attempt.finished_at,
+        time_used_seconds=attempt.time_used_seconds,
+        results=results,
+    )
+
+
+@router.patch("/{quiz_id}/questions/{question_id}", response_model=QuestionKeyUpdateResponse)
+async def update_question_key(
+    quiz_id: uuid.UUID,
+    question_id: uuid.UUID,
+    correction: QuestionKeyUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> QuestionKeyUpdateResponse:
+    """Correct a question's answer or points and re-grade every finished attempt."""
+    quiz = await _get_quiz(db, quiz_id, user)
+    if quiz.author_id != user.id:
+        raise HTTPException(status_code=403, detail="Not the author of this quiz")
+    question = await db.get(QuizQuestion, question_id)
+    if question is None or question.quiz_id != quiz.id:
+        raise HTTPException(status_code=404, detail="Question not found")
+    if correction.correct_choice is not None and correction.correct_choice >= len(question.choices):
+        raise HTTPException(status_code=422, detail="correct_choice is out of range")
+
+    if correction.correct_choice is not None:
+        question.correct_choice = correction.correct_choice
+    if correction.points is not None:
+        question.points = correction.points
+    await db.flush()
+
+    # The key change and the new scores commit together.
+    regraded = await regrade_quiz(db, quiz)
+    await db.commit()
+    # Bulk updates skip mapper events, and a best score may now have dropped.
+    await refresh_quiz_leaderboard(db, quiz.id)
+    return QuestionKeyUpdateResponse(
+        question_id=str(question.id),
+        correct_choice=question.correct_choice,
+        points=question.points,
+        regraded_attempts=regraded,
+    )
+
+
+@router.get("/{quiz_id}/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    quiz_id: uuid.UUID,
+    limit: int = Query(default=10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> LeaderboardResponse:
+    """Top users by best score, then least time, plus the caller's rank and percentile."""
+    quiz = await _get_quiz(db, quiz_id, user)
+    top = leaderboards.top(quiz.id, limit)
+    standing = leaderboards.standing(quiz.id, user.id)
+
+    summaries = {}
+    if top:
+        rows = (await db.execute(
+            select(User.id, User.username, User.real_name, User.avatar_url)
+            .where(User.id.in_([entry.user_id for entry in top]))
+        )).all()
+        summaries = {
+            row.id: AuthorSummary(
+                id=str(row.id),
+                username=row.username,
+                real_name=row.real_name,
+                avatar_url=row.avatar_url,
+            )
+            for row in rows
+        }
+
+    me = None
+    if standing is not None:
+        me = LeaderboardStanding(
+            rank=standing.rank,
+            percentile=standing.percentile,
+            score=standing.score,
+            time_used_seconds=standing.time_used_seconds,
+        )
+    return LeaderboardResponse(
+        total=leaderboards.size(quiz.id),
+        top=[
+            LeaderboardRow(
+                rank=entry.rank,
+                user=summaries.get(entry.user_id),
+                score=entry.score,
+                time_used_seconds=entry.time_used_seconds,
+            )
+            for entry in top
+        ],
+        me=me,
+    )
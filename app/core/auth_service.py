@@ -1,8 +1,21 @@
 """Authentication service using Supabase Auth (not database operations)."""
+import asyncio
+import hashlib
 from supabase import Client, create_client
-from typing import Optional
+from typing import Any, Optional
 
-from app.core.config import SUPABASE_URL, SUPABASE_KEY
+import httpx
+
+from app.core.cache import TTLCache
+from app.core.config import (
+    AUTH_HTTP_MAX_CONNECTIONS,
+    AUTH_HTTP_MAX_KEEPALIVE,
+    AUTH_HTTP_TIMEOUT_SECONDS,
+    AUTH_USER_CACHE_MAX_ENTRIES,
+    AUTH_USER_CACHE_TTL_SECONDS,
+    SUPABASE_KEY,
+    SUPABASE_URL,
+)
 
 
 class SupabaseAuthService:
@@ -48,5 +61,152 @@ class SupabaseAuthService:
         return self.client.auth.get_user(access_token)
 
 
+class AuthServiceError(Exception):
+    """Supabase Auth rejected a request or could not be reached."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Mark a failure as seen, so one every waiter abandoned isn't logged.
+    if not task.cancelled():
+        task.exception()
+
+
+class AsyncSupabaseAuthService:
+    """Async Supabase Auth client over one shared keep-alive connection pool.
+
+    Calls the GoTrue REST API directly with httpx, so waiting on Supabase
+    never holds a worker thread. Successful `get_user` results are cached
+    for AUTH_USER_CACHE_TTL_SECONDS under a hash of the token, unless the
+    caller asks for a fresh answer. Concurrent cached lookups of the same
+    token share one request.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = SUPABASE_URL,
+        key: Optional[str] = SUPABASE_KEY,
+        cache_ttl_seconds: float = AUTH_USER_CACHE_TTL_SECONDS,
+        cache_max_entries: int = AUTH_USER_CACHE_MAX_ENTRIES,
+    ):
+        self.url = (url or "").rstrip("/")
+        self.key = key
+        self.user_cache = TTLCache(max_entries=cache_max_entries, ttl_seconds=cache_ttl_seconds)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazily created pooled client, shared by every call."""
+        if self._client is None:
+            if not self.url or not self.key:
+                # Surfaces as a 503 from callers, like an unreachable Supabase.
+                raise AuthServiceError(
+                    503,
+                    "Supabase credentials not configured. "
+                    "Set SUPABASE_URL and SUPABASE_KEY environment variables.",
+                )
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.url}/auth/v1",
+                headers={"apikey": self.key},
+                timeout=AUTH_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=AUTH_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=AUTH_HTTP_MAX_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    async def _request(self, method: str, path: str, access_token: Optional[str] = None, **kwargs) -> Any:
+        headers = {"Authorization": f"Bearer {access_token or self.key}"}
+        try:
+            response = await self.client.request(method, path, headers=headers, **kwargs)
+        except httpx.HTTPError as exc:
+            raise AuthServiceError(503, f"Supabase Auth unreachable: {exc}") from exc
+
+        if response.status_code >= 400:
+            try:
+                body = response.json()
+                message = body.get("msg") or body.get("error_description") or body.get("message") or response.text
+            except ValueError:
+                message = response.text
+            raise AuthServiceError(response.status_code, message)
+        return response.json() if response.content else None
+
+    @staticmethod
+    def _cache_key(access_token: str) -> str:
+        # Never keep raw tokens in memory longer than the request needs them.
+        return hashlib.sha256(access_token.encode()).hexdigest()
+
+    async def sign_up(self, email: str, password: str, redirect_url: Optional[str] = None) -> dict:
+        """Register a new user with Supabase Auth."""
+        params = {"redirect_to": redirect_url} if redirect_url else None
+        return await self._request(
+            "POST", "/signup", json={"email": email, "password": password}, params=params
+        )
+
+    async def sign_in(self, email: str, password: str) -> dict:
+        """Sign in with email and password; returns the session (tokens + user)."""
+        return await self._request(
+            "POST", "/token", params={"grant_type": "password"},
+            json={"email": email, "password": password},
+        )
+
+    async def sign_out(self, access_token: str) -> None:
+        """Revoke the session behind `access_token` and forget its cached user."""
+        self.user_cache.pop(self._cache_key(access_token))
+        await self._request("POST", "/logout", access_token=access_token)
+
+    async def get_user(self, access_token: str, use_cache: bool = True) -> dict:
+        """User for a valid access token; raises AuthServiceError otherwise.
+
+        Cached answers can outlive a revoked session by the cache TTL. Pass
+        `use_cache=False` where revocation must be seen at once; that always
+        asks Supabase and refreshes the cached entry.
+        """
+        cache_key = self._cache_key(access_token)
+        if not use_cache:
+            generation = self.user_cache.generation
+            try:
+                user = await self._request("GET", "/user", access_token=access_token)
+            except AuthServiceError:
+                self.user_cache.pop(cache_key)
+                raise
+            self.user_cache.set(cache_key, user, generation)
+            return user
+
+        user = self.user_cache.get(cache_key)
+        if user is not None:
+            return user
+
+        pending = self._inflight.get(cache_key)
+        if pending is None:
+            # Its own task, so a waiter being cancelled (e.g. its client hung
+            # up) never cancels the request the other waiters share.
+            pending = asyncio.get_running_loop().create_task(self._fetch_user(access_token, cache_key))
+            pending.add_done_callback(_retrieve_exception)
+            self._inflight[cache_key] = pending
+        return await asyncio.shield(pending)
+
+    async def _fetch_user(self, access_token: str, cache_key: str) -> dict:
+        generation = self.user_cache.generation
+        try:
+            user = await self._request("GET", "/user", access_token=access_token)
+            self.user_cache.set(cache_key, user, generation)
+            return user
+        finally:
+            del self._inflight[cache_key]
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
 # Singleton instance
-supabase_auth = SupabaseAuthService()
\ No newline at end of file
+supabase_auth = SupabaseAuthService()
+async_supabase_auth = AsyncSupabaseAuthService()
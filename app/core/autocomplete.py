@@ -0,0 +1,261 @@
+"""Prefix and fuzzy user lookup for the mention/autocomplete box.
+
+Postgres answers with pg_trgm GIN indexes on `username` and `real_name`,
+added by migration (or by `init_db` on fresh databases). Other databases
+use an in-memory index built at startup and kept current from User
+writes once they commit: a sorted key list for prefix matches via bisect, plus a
+trigram inverted index for fuzzy matches when prefixes run short.
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import Counter
+import threading
+from typing import Iterable, List, NamedTuple, Optional
+import uuid
+
+from sqlalchemy import case, event, func, or_, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import DATABASE_URL
+from app.models.user import User
+
+
+class UserEntry(NamedTuple):
+    id: uuid.UUID
+    username: str
+    real_name: Optional[str]
+    avatar_url: Optional[str]
+
+
+def _trigrams(value: str) -> set[str]:
+    """pg_trgm-style trigrams: lowercase, padded with two leading blanks and one trailing."""
+    trigrams = set()
+    for word in value.lower().split():
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class UserPrefixIndex:
+    """Sorted prefix keys plus a trigram index over active users."""
+
+    def __init__(self):
+        self._users: dict[uuid.UUID, UserEntry] = {}
+        # (key, user_id) sorted; keys are the username, full real name and each name word.
+        self._keys: List[tuple[str, uuid.UUID]] = []
+        self._trigram_postings: dict[str, set[uuid.UUID]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys_for(entry: UserEntry) -> set[str]:
+        keys = {entry.username.lower()}
+        if entry.real_name:
+            real_name = entry.real_name.lower()
+            keys.add(real_name)
+            keys.update(real_name.split())
+        return keys
+
+    @staticmethod
+    def _trigrams_for(entry: UserEntry) -> set[str]:
+        return _trigrams(entry.username) | _trigrams(entry.real_name or "")
+
+    def load(self, entries: Iterable[UserEntry]) -> None:
+        """Replace the index contents."""
+        with self._lock:
+            self._users = {}
+            self._trigram_postings = {}
+            keys = []
+            for entry in entries:
+                self._users[entry.id] = entry
+                keys.extend((key, entry.id) for key in self._keys_for(entry))
+                for trigram in self._trigrams_for(entry):
+                    self._trigram_postings.setdefault(trigram, set()).add(entry.id)
+            self._keys = sorted(keys)
+
+    def upsert(self, entry: UserEntry) -> None:
+        with self._lock:
+            self._discard(entry.id)
+            self._users[entry.id] = entry
+            for key in self._keys_for(entry):
+                insort(self._keys, (key, entry.id))
+            for trigram in self._trigrams_for(entry):
+                self._trigram_postings.setdefault(trigram, set()).add(entry.id)
+
+    def remove(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._discard(user_id)
+
+    def search(self, prefix: str, limit: int) -> List[UserEntry]:
+        """Prefix matches first (alphabetical), then fuzzy trigram matches."""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+
+        with self._lock:
+            found: dict[uuid.UUID, UserEntry] = {}
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(found) < limit:
+                key, user_id = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                found.setdefault(user_id, self._users[user_id])
+                position += 1
+
+            if len(found) < limit:
+                query_trigrams = _trigrams(prefix)
+                overlap = Counter()
+                for trigram in query_trigrams:
+                    overlap.update(self._trigram_postings.get(trigram, ()))
+                for user_id, shared in overlap.most_common():
+                    if len(found) >= limit:
+                        break
+                    # Require 30% of the query's trigrams, like pg_trgm's default threshold.
+                    if shared / len(query_trigrams) < 0.3:
+                        break
+                    found.setdefault(user_id, self._users[user_id])
+
+            return list(found.values())
+
+    def _discard(self, user_id: uuid.UUID) -> None:
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+        for key in self._keys_for(entry):
+            position = bisect_left(self._keys, (key, user_id))
+            if position < len(self._keys) and self._keys[position] == (key, user_id):
+                del self._keys[position]
+        for trigram in self._trigrams_for(entry):
+            postings = self._trigram_postings.get(trigram)
+            if postings is not None:
+                postings.discard(user_id)
+                if not postings:
+                    del self._trigram_postings[trigram]
+
+
+class AutocompleteBackend(ABC):
+    """Interface for user lookup backends."""
+
+    def setup(self, connection) -> None:
+        """Create backend-specific structures if they are missing."""
+
+    def load(self, db) -> None:
+        """Warm any in-process state from a sync session."""
+
+    @abstractmethod
+    async def suggest(self, db, prefix: str, limit: int) -> List[UserEntry]:
+        """Active users matching `prefix`, best first."""
+
+    def upsert(self, entry: UserEntry) -> None:
+        """Reflect a committed active user."""
+
+    def remove(self, user_id: uuid.UUID) -> None:
+        """Reflect a committed delete or deactivation."""
+
+
+class PostgresAutocompleteBackend(AutocompleteBackend):
+    """pg_trgm: ILIKE 'prefix%' and `%` similarity both use the GIN indexes."""
+
+    def setup(self, connection) -> None:
+        # Same DDL as the migration, for databases built with create_all.
+        # Checked first, so restarts don't take a lock on `users` for a no-op.
+        if connection.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is None:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for column_name in ("username", "real_name"):
+            index = f"ix_users_{column_name}_trgm"
+            if connection.execute(text(f"SELECT to_regclass('{index}')")).scalar() is None:
+                connection.execute(text(
+                    f"CREATE INDEX {index} ON users USING gin ({column_name} gin_trgm_ops)"
+                ))
+
+    async def suggest(self, db, prefix: str, limit: int) -> List[UserEntry]:
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        is_prefix = or_(User.username.ilike(pattern), User.real_name.ilike(pattern))
+        similarity = func.greatest(
+            func.similarity(User.username, prefix),
+            func.coalesce(func.similarity(User.real_name, prefix), 0),
+        )
+        rows = (await db.execute(
+            select(User.id, User.username, User.real_name, User.avatar_url)
+            .where(
+                User.is_active == True,
+                or_(
+                    is_prefix,
+                    User.username.op("%")(prefix),
+                    User.real_name.op("%")(prefix),
+                ),
+            )
+            .order_by(case((is_prefix, 0), else_=1), similarity.desc(), User.username)
+            .limit(limit)
+        )).all()
+        return [UserEntry(*row) for row in rows]
+
+
+class MemoryAutocompleteBackend(AutocompleteBackend):
+    """In-process UserPrefixIndex, for SQLite and other backends without pg_trgm."""
+
+    def __init__(self):
+        self.index = UserPrefixIndex()
+
+    def load(self, db) -> None:
+        rows = db.execute(
+            select(User.id, User.username, User.real_name, User.avatar_url)
+            .where(User.is_active == True)
+        ).all()
+        self.index.load(UserEntry(*row) for row in rows)
+
+    async def suggest(self, db, prefix: str, limit: int) -> List[UserEntry]:
+        return self.index.search(prefix, limit)
+
+    def upsert(self, entry: UserEntry) -> None:
+        self.index.upsert(entry)
+
+    def remove(self, user_id: uuid.UUID) -> None:
+        self.index.remove(user_id)
+
+
+def get_autocomplete_backend(database_url: str = DATABASE_URL) -> AutocompleteBackend:
+    """Pick the backend matching the configured database."""
+    if make_url(database_url).get_backend_name() == "postgresql":
+        return PostgresAutocompleteBackend()
+    return MemoryAutocompleteBackend()
+
+
+autocomplete_backend = get_autocomplete_backend()
+
+
+def _queue(target, change) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("autocomplete_changes", []).append(change)
+
+
+# Users are snapshotted at flush: committed objects expire, and a rolled
+# back write must never reach the index.
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+def _index_user(mapper, connection, target) -> None:
+    if target.is_active:
+        _queue(target, ("upsert", UserEntry(target.id, target.username, target.real_name, target.avatar_url)))
+    else:
+        _queue(target, ("remove", target.id))
+
+
+@event.listens_for(User, "after_delete")
+def _unindex_user(mapper, connection, target) -> None:
+    _queue(target, ("remove", target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_autocomplete_changes(session) -> None:
+    for change, arg in session.info.pop("autocomplete_changes", ()):
+        getattr(autocomplete_backend, change)(arg)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_autocomplete_changes(session) -> None:
+    session.info.pop("autocomplete_changes", None)
@@ -0,0 +1,214 @@
+"""Content-addressed, reference-counted storage for uploaded media.
+
+Every stored object is named after the SHA-256 of its bytes and recorded
+once in `blobs`, however many Asset rows point at it. Asset mapper events
+keep `Blob.ref_count` current. Writers that reuse stored content take
+their reference up front with `acquire_blob`, so a concurrent collection
+can't delete the blob between the lookup and the Asset insert. Once a
+commit drops a blob to zero, the row and the stored object are deleted in
+the background. A full sweep at startup also recounts references, which
+repairs counts after database-level cascades that the ORM never saw.
+"""
+import asyncio
+import mimetypes
+from collections import Counter
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, event, exists, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, object_session
+
+from app.core.storage import storage
+from app.db.session import async_engine
+from app.models.assets import Asset
+from app.models.blob import Blob
+
+_blobs = Blob.__table__
+_assets = Asset.__table__
+
+
+def blob_key(sha256: str, media_type: str) -> str:
+    """Storage key for content with this hash; fanned out by the first two hex digits."""
+    extension = mimetypes.guess_extension(media_type) or ""
+    return f"blobs/{sha256[:2]}/{sha256}{extension}"
+
+
+def insert_blobs(dialect_name: str, rows: List[dict]):
+    """INSERT of blob rows that skips hashes already present.
+
+    Concurrent uploads of the same new content may both get here; the
+    conflict clause lets the second one fall through instead of failing.
+    """
+    if dialect_name == "postgresql":
+        statement = postgresql.insert(Blob).values(rows)
+    else:
+        statement = sqlite.insert(Blob).values(rows)
+    return statement.on_conflict_do_nothing(index_elements=["hash"])
+
+
+_BLOB_COLUMNS = (_blobs.c.hash, _blobs.c.storage_key, _blobs.c.size, _blobs.c.media_type)
+
+
+def _hold(db, blob_hash: str) -> None:
+    # The next Asset inserted for this hash uses the reference taken here.
+    db.info.setdefault("held_blob_refs", Counter())[blob_hash] += 1
+
+
+async def acquire_blob(db, blob_hash: str):
+    """Take a reference to a stored blob; its row, or None if not stored.
+
+    A single UPDATE ... RETURNING, so a collection racing this either ran
+    first (no row) or sees the raised count and keeps the blob. The
+    reference is held for the next Asset inserted with this hash in the
+    same transaction.
+    """
+    row = (await db.execute(
+        update(_blobs)
+        .where(_blobs.c.hash == blob_hash)
+        .values(ref_count=_blobs.c.ref_count + 1)
+        .returning(*_BLOB_COLUMNS)
+    )).first()
+    if row is not None:
+        _hold(db, blob_hash)
+    return row
+
+
+async def store_blob(db, row: dict):
+    """Record newly stored content with one held reference; returns the blob row.
+
+    If the same content was recorded concurrently, that row is acquired
+    instead; its storage key may differ from the one in `row`.
+    """
+    dialect_name = db.get_bind().dialect.name
+    while True:
+        inserted = await db.execute(insert_blobs(dialect_name, [{**row, "ref_count": 1}]))
+        if inserted.rowcount:
+            _hold(db, row["hash"])
+            return (await db.execute(select(*_BLOB_COLUMNS).where(_blobs.c.hash == row["hash"]))).one()
+        blob = await acquire_blob(db, row["hash"])
+        if blob is not None:
+            return blob
+        # The conflicting row was collected in between; insert again.
+
+
+async def acquire_or_store_blob(db, sha256: str, data: bytes, media_type: str):
+    """Reference in-memory content, storing it first if it isn't already; returns the blob row."""
+    blob = await acquire_blob(db, sha256)
+    if blob is not None:
+        return blob
+
+    key = blob_key(sha256, media_type)
+    await asyncio.to_thread(storage.save, key, data, media_type)
+    blob = await store_blob(db, {"hash": sha256, "storage_key": key, "size": len(data), "media_type": media_type})
+    if blob.storage_key != key:
+        # Stored concurrently under another type's key; keep theirs.
+        await storage.delete(key)
+    return blob
+
+
+async def collect_blobs(hashes: Optional[Iterable[str]] = None) -> int:
+    """Delete unreferenced blobs and their stored objects.
+
+    With `hashes`, only those blobs are considered. Without, every blob's
+    reference count is recomputed first.
+    """
+    referenced = exists().where(_assets.c.blob_hash == _blobs.c.hash)
+    statement = delete(_blobs).where(_blobs.c.ref_count <= 0, ~referenced)
+    if hashes is not None:
+        statement = statement.where(_blobs.c.hash.in_(list(hashes)))
+
+    async with async_engine.begin() as connection:
+        if hashes is None:
+            await connection.execute(
+                update(_blobs).values(
+                    ref_count=select(func.count())
+                    .where(_assets.c.blob_hash == _blobs.c.hash)
+                    .scalar_subquery()
+                )
+            )
+        keys = (await connection.execute(statement.returning(_blobs.c.storage_key))).scalars().all()
+
+    for key in keys:
+        try:
+            await storage.delete(key)
+        except Exception as exc:
+            print(f"Error deleting blob {key}: {exc}")
+    return len(keys)
+
+
+_collections: Set[asyncio.Task] = set()
+
+
+def schedule_blob_collection(hashes: Optional[Iterable[str]] = None) -> None:
+    """Run `collect_blobs` on the running loop without waiting for it."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop (e.g. a sync script); the next startup sweep catches these.
+        return
+    task = loop.create_task(collect_blobs(hashes))
+    _collections.add(task)
+    task.add_done_callback(_collections.discard)
+
+
+def _adjust_ref_count(connection, blob_hash: str, delta: int) -> None:
+    connection.execute(
+        update(_blobs)
+        .where(_blobs.c.hash == blob_hash)
+        .values(ref_count=_blobs.c.ref_count + delta)
+    )
+
+
+def _release(target, blob_hash: str) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("released_blobs", set()).add(blob_hash)
+
+
+def _take_held(target, blob_hash: str) -> bool:
+    session = object_session(target)
+    held = session.info.get("held_blob_refs") if session is not None else None
+    if not held or not held[blob_hash]:
+        return False
+    held[blob_hash] -= 1
+    return True
+
+
+@event.listens_for(Asset, "after_insert")
+def _acquire_blob(mapper, connection, target) -> None:
+    if target.blob_hash and not _take_held(target, target.blob_hash):
+        _adjust_ref_count(connection, target.blob_hash, 1)
+
+
+@event.listens_for(Asset, "after_update")
+def _move_blob_reference(mapper, connection, target) -> None:
+    history = inspect(target).attrs.blob_hash.history
+    if not history.has_changes():
+        return
+    for old_hash in history.deleted:
+        if old_hash:
+            _adjust_ref_count(connection, old_hash, -1)
+            _release(target, old_hash)
+    if target.blob_hash:
+        _adjust_ref_count(connection, target.blob_hash, 1)
+
+
+@event.listens_for(Asset, "after_delete")
+def _release_blob(mapper, connection, target) -> None:
+    if target.blob_hash:
+        _adjust_ref_count(connection, target.blob_hash, -1)
+        _release(target, target.blob_hash)
+
+
+@event.listens_for(Session, "after_commit")
+def _collect_released_blobs(session) -> None:
+    session.info.pop("held_blob_refs", None)
+    released = session.info.pop("released_blobs", None)
+    if released:
+        schedule_blob_collection(released)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_released_blobs(session) -> None:
+    session.info.pop("released_blobs", None)
+    session.info.pop("held_blob_refs", None)
@@ -33,3 +33,66 @@ SUPABASE_KEY = (
     or os.getenv("SUPABASE_ANON_KEY")
     or os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 )
+
+# In-process homepage feed cache; entries are also dropped on every Post write.
+FEED_CACHE_TTL_SECONDS = float(os.getenv("FEED_CACHE_TTL_SECONDS", "30"))
+FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "256"))
+
+# Popularity ranking: score = (views + LIKE_WEIGHT * likes) / (age_hours + 2) ** GRAVITY
+POPULARITY_GRAVITY = float(os.getenv("POPULARITY_GRAVITY", "1.8"))
+POPULARITY_LIKE_WEIGHT = float(os.getenv("POPULARITY_LIKE_WEIGHT", "5"))
+POPULARITY_RESCORE_SECONDS = float(os.getenv("POPULARITY_RESCORE_SECONDS", "300"))
+
+# Write-behind view counter: buffered views are flushed on this interval, or
+# as soon as this many views are pending, whichever comes first.
+VIEW_FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_FLUSH_INTERVAL_SECONDS", "5"))
+VIEW_FLUSH_THRESHOLD = int(os.getenv("VIEW_FLUSH_THRESHOLD", "1000"))
+
+# Pre-serialized profile responses, dropped on User writes. Misses (unknown
+# usernames/ids) are remembered for a much shorter time.
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "60"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "4096"))
+PROFILE_MISS_TTL_SECONDS = float(os.getenv("PROFILE_MISS_TTL_SECONDS", "10"))
+PROFILE_MISS_MAX_ENTRIES = int(os.getenv("PROFILE_MISS_MAX_ENTRIES", "16384"))
+
+# Local media storage; files are served by the app under MEDIA_URL.
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR.parent / "media"))
+MEDIA_URL = os.getenv("MEDIA_URL", "/media")
+
+# Image derivatives are rendered in a separate process pool of this size.
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+# Where uploads go: "local" (MEDIA_ROOT) or "supabase" (Supabase Storage bucket).
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+SUPABASE_STORAGE_BUCKET = os.getenv("SUPABASE_STORAGE_BUCKET", "post-images")
+
+# Uploads are streamed to storage in chunks of this size and capped at MAX_UPLOAD_BYTES.
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(256 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+
+# Access tokens are verified locally. Asymmetric tokens use the project's
+# JWKS (refreshed in the background); legacy HS256 tokens use the JWT secret.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL") or (
+    f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json" if SUPABASE_URL else None
+)
+SUPABASE_JWT_ISSUER = os.getenv("SUPABASE_JWT_ISSUER") or (
+    f"{SUPABASE_URL}/auth/v1" if SUPABASE_URL else None
+)
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+JWKS_REFRESH_SECONDS = float(os.getenv("JWKS_REFRESH_SECONDS", "600"))
+JWT_LEEWAY_SECONDS = float(os.getenv("JWT_LEEWAY_SECONDS", "30"))
+
+# Async Supabase Auth client: one shared keep-alive pool, plus a short-lived
+# cache of token -> user lookups so repeat checks skip the round trip.
+AUTH_HTTP_MAX_CONNECTIONS = int(os.getenv("AUTH_HTTP_MAX_CONNECTIONS", "100"))
+AUTH_HTTP_MAX_KEEPALIVE = int(os.getenv("AUTH_HTTP_MAX_KEEPALIVE", "20"))
+AUTH_HTTP_TIMEOUT_SECONDS = float(os.getenv("AUTH_HTTP_TIMEOUT_SECONDS", "10"))
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30"))
+AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Per-quiz leaderboards live in memory and are snapshotted to this file on
+# this interval (and at shutdown), so a restart only reloads quizzes that
+# changed since the last snapshot.
+LEADERBOARD_SNAPSHOT_PATH = Path(os.getenv("LEADERBOARD_SNAPSHOT_PATH", BASE_DIR.parent / "leaderboards.json"))
+LEADERBOARD_SNAPSHOT_SECONDS = float(os.getenv("LEADERBOARD_SNAPSHOT_SECONDS", "300"))
@@ -1,9 +1,105 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import case, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
 
-from app.db.session import get_db
+from app.core.auth_service import AuthServiceError, async_supabase_auth
+from app.core.cache import TTLCache
+from app.core.config import AUTH_USER_CACHE_MAX_ENTRIES, AUTH_USER_CACHE_TTL_SECONDS
+from app.core.security import AuthenticatedUser, TokenError, token_verifier
+from app.db.session import get_async_db, get_db
+from app.models.user import User
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Supabase auth uid -> local users.id; like cached sessions, a deactivation
+# can take up to the TTL to be seen.
+local_user_ids = TTLCache(max_entries=AUTH_USER_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_USER_CACHE_TTL_SECONDS)
 
 
 def get_database() -> Generator[Session, None, None]:
     """Dependency for getting database sessions."""
-    yield from get_db()
\ No newline at end of file
+    yield from get_db()
+
+
+async def get_async_database() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database sessions."""
+    async for db in get_async_db():
+        yield db
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=401,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _local_user_id(db: AsyncSession, identity: AuthenticatedUser) -> Optional[uuid.UUID]:
+    """The active local user for a Supabase identity.
+
+    Supabase Auth and `users` keep separate ids. A row whose id is the auth
+    uid wins; otherwise the row with the token's email is the account.
+    """
+    user_id = local_user_ids.get(identity.id)
+    if user_id is not None:
+        return user_id
+
+    same_id = User.id == identity.id
+    match = [same_id, User.email == identity.email] if identity.email else [same_id]
+    user_id = (await db.execute(
+        select(User.id)
+        .where(User.is_active == True, or_(*match))
+        .order_by(case((same_id, 0), else_=1))
+        .limit(1)
+    )).scalar_one_or_none()
+    if user_id is not None:
+        local_user_ids.set(identity.id, user_id)
+    return user_id
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthenticatedUser:
+    """Dependency for the caller's identity, verified locally from the bearer token.
+
+    `id` is the caller's local `users.id`; the Supabase auth uid stays in
+    `claims["sub"]`.
+    """
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    try:
+        identity = await token_verifier.verify(credentials.credentials)
+    except TokenError as exc:
+        raise _unauthorized(f"Invalid token: {exc}")
+
+    user_id = await _local_user_id(db, identity)
+    if user_id is None:
+        raise HTTPException(status_code=403, detail="No active account for this login")
+    return identity._replace(id=user_id)
+
+
+async def get_verified_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> AuthenticatedUser:
+    """Like get_current_user, but also confirms with Supabase that the session
+    wasn't revoked. Costs a round trip; use it for revocation-sensitive routes."""
+    try:
+        # Never from the user cache: a revoked session must fail right away.
+        confirmed = await async_supabase_auth.get_user(credentials.credentials, use_cache=False)
+    except AuthServiceError as exc:
+        print(f"Error confirming session with Supabase: {exc}")
+        if exc.status_code >= 500:
+            raise HTTPException(status_code=503, detail="Authentication service unavailable")
+        raise _unauthorized("Session has been revoked")
+
+    if str(confirmed.get("id")) != str(user.claims.get("sub")):
+        raise _unauthorized("Session has been revoked")
+    return user
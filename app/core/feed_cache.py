@@ -0,0 +1,99 @@
+"""Read-through cache for the homepage feed, invalidated by Post/Asset writes
+and by edits to the author fields the feed embeds.
+
+Each flush with such writes also bumps the `feed.version` row in
+`stat_counters` once, in the same transaction. Feed ETags are built from
+that number, so any insert, edit, unpublish or delete changes them, not
+only a write to the newest post.
+"""
+from datetime import datetime
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import FEED_CACHE_MAX_ENTRIES, FEED_CACHE_TTL_SECONDS
+from app.models.assets import Asset
+from app.models.post import Post
+from app.models.stat_counter import StatCounter
+from app.models.user import User
+
+FEED_VERSION = "feed.version"
+
+# User columns copied into each post's author_summary.
+_AUTHOR_FIELDS = ("username", "real_name", "avatar_url")
+
+feed_cache = TTLCache(
+    max_entries=FEED_CACHE_MAX_ENTRIES,
+    ttl_seconds=FEED_CACHE_TTL_SECONDS,
+)
+
+
+async def feed_version(db) -> int:
+    """Current feed version; one primary-key lookup."""
+    value = (await db.execute(
+        select(StatCounter.value).where(StatCounter.name == FEED_VERSION)
+    )).scalar_one_or_none()
+    return value or 0
+
+
+def bump_feed_version(connection) -> None:
+    """Increment the feed version in the connection's transaction, creating the row if needed."""
+    if connection.dialect.name == "postgresql":
+        statement = postgresql.insert(StatCounter)
+    else:
+        statement = sqlite.insert(StatCounter)
+    statement = statement.values(name=FEED_VERSION, value=1, updated_at=datetime.utcnow())
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": StatCounter.value + 1, "updated_at": statement.excluded.updated_at},
+    ))
+
+
+@event.listens_for(Post, "after_insert")
+@event.listens_for(Post, "after_update")
+@event.listens_for(Post, "after_delete")
+@event.listens_for(Asset, "after_insert")
+@event.listens_for(Asset, "after_update")
+@event.listens_for(Asset, "after_delete")
+def _invalidate_feed_cache(mapper, connection, target) -> None:
+    """Any post or asset write may change what the feed shows; handled once per flush."""
+    session = object_session(target)
+    if session is not None:
+        session.info["feed_changed"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_feed_version(session, flush_context) -> None:
+    """One counter bump and cache clear per flush, however many rows it wrote."""
+    if session.info.pop("feed_changed", False):
+        bump_feed_version(session.connection())
+        feed_cache.clear()
+        session.info["feed_cache_dirty"] = True
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_feed_cache_for_author(mapper, connection, target) -> None:
+    """Feed items embed author summaries, so renaming an author changes the feed too."""
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _AUTHOR_FIELDS):
+        _invalidate_feed_cache(mapper, connection, target)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_feed_cache_for_deleted_author(mapper, connection, target) -> None:
+    _invalidate_feed_cache(mapper, connection, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_feed_cache_on_commit(session) -> None:
+    """Clear again once committed, so reads racing the flush can't keep stale rows."""
+    if session.info.pop("feed_cache_dirty", False):
+        feed_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_feed_changes(session) -> None:
+    session.info.pop("feed_changed", None)
+    session.info.pop("feed_cache_dirty", None)
@@ -0,0 +1,203 @@
+"""In-memory adjacency index of accepted friendships.
+
+Mutual friends and "people you may know" would otherwise need self-joins
+on `friendships` per request. Instead every user gets a compact int id
+and a set of their friends' int ids. Mutuals are then one set
+intersection, and suggestions count 2-hop paths over the caller's
+friends. The index is built at startup and kept current from Friendship
+mapper events. Those only queue edge changes during the flush; the graph
+changes once the commit lands, so rolled-back writes never show up.
+"""
+from collections import Counter
+import heapq
+import threading
+from typing import Iterable, List, Set, Tuple
+import uuid
+
+from sqlalchemy import and_, event, inspect, or_, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.friendship import Friendship, FriendshipStatus
+from app.models.user import User
+
+
+class FriendGraph:
+    """Undirected graph of accepted friendships keyed by compact int ids."""
+
+    def __init__(self):
+        self._ids: dict[uuid.UUID, int] = {}
+        self._uuids: List[uuid.UUID] = []
+        self._friends: List[Set[int]] = []
+        self._lock = threading.Lock()
+
+    def _intern(self, user_id: uuid.UUID) -> int:
+        node = self._ids.get(user_id)
+        if node is None:
+            node = len(self._uuids)
+            self._ids[user_id] = node
+            self._uuids.append(user_id)
+            self._friends.append(set())
+        return node
+
+    def load(self, edges: Iterable[Tuple[uuid.UUID, uuid.UUID]]) -> None:
+        """Replace the graph from (requester_id, addressee_id) pairs."""
+        with self._lock:
+            self._ids = {}
+            self._uuids = []
+            self._friends = []
+            for a, b in edges:
+                self._link(a, b)
+
+    def add_edge(self, a: uuid.UUID, b: uuid.UUID) -> None:
+        with self._lock:
+            self._link(a, b)
+
+    def remove_edge(self, a: uuid.UUID, b: uuid.UUID) -> None:
+        with self._lock:
+            node_a, node_b = self._ids.get(a), self._ids.get(b)
+            if node_a is None or node_b is None:
+                return
+            self._friends[node_a].discard(node_b)
+            self._friends[node_b].discard(node_a)
+
+    def remove_user(self, user_id: uuid.UUID) -> None:
+        """Drop every edge of a deleted user; the int id stays reserved."""
+        with self._lock:
+            node = self._ids.get(user_id)
+            if node is None:
+                return
+            for friend in self._friends[node]:
+                self._friends[friend].discard(node)
+            self._friends[node] = set()
+
+    def mutuals(self, a: uuid.UUID, b: uuid.UUID) -> List[uuid.UUID]:
+        """Friends `a` and `b` have in common."""
+        with self._lock:
+            node_a, node_b = self._ids.get(a), self._ids.get(b)
+            if node_a is None or node_b is None:
+                return []
+            common = self._friends[node_a] & self._friends[node_b]
+            return [self._uuids[node] for node in common]
+
+    def suggestions(
+        self,
+        user_id: uuid.UUID,
+        limit: int,
+        exclude: Iterable[uuid.UUID] = (),
+    ) -> List[Tuple[uuid.UUID, int]]:
+        """Friends of friends, ranked by how many mutual friends they share.
+
+        Returns (user_id, mutual_count) pairs, most mutuals first. `exclude`
+        drops users the caller already has some other relationship with.
+        """
+        with self._lock:
+            node = self._ids.get(user_id)
+            if node is None:
+                return []
+
+            friends = self._friends[node]
+            skipped = {node, *friends}
+            skipped.update(self._ids[other] for other in exclude if other in self._ids)
+
+            counts: Counter = Counter()
+            for friend in friends:
+                counts.update(self._friends[friend])
+            for skip in skipped:
+                counts.pop(skip, None)
+
+            # Ties go to the lower int id, i.e. whoever was indexed first.
+            best = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+            return [(self._uuids[candidate], count) for candidate, count in best]
+
+    def _link(self, a: uuid.UUID, b: uuid.UUID) -> None:
+        if a == b:
+            return
+        node_a, node_b = self._intern(a), self._intern(b)
+        self._friends[node_a].add(node_b)
+        self._friends[node_b].add(node_a)
+
+
+friend_graph = FriendGraph()
+
+
+def load_friend_graph(db) -> None:
+    """Build the graph from every accepted friendship; run once at startup."""
+    rows = db.execute(
+        select(Friendship.requester_id, Friendship.addressee_id)
+        .where(Friendship.status == FriendshipStatus.ACCEPTED)
+    ).all()
+    friend_graph.load(rows)
+
+
+def _queue(target, change: tuple) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("friend_graph_changes", []).append(change)
+
+
+def _unlink_unless_still_friends(connection, target, a: uuid.UUID, b: uuid.UUID) -> None:
+    # Rows in both directions can exist for one pair; only unlink when none is left.
+    table = Friendship.__table__
+    remaining = connection.execute(
+        select(table.c.id)
+        .where(
+            table.c.status == FriendshipStatus.ACCEPTED,
+            or_(
+                and_(table.c.requester_id == a, table.c.addressee_id == b),
+                and_(table.c.requester_id == b, table.c.addressee_id == a),
+            ),
+        )
+        .limit(1)
+    ).first()
+    if remaining is None:
+        _queue(target, ("remove_edge", a, b))
+
+
+def _previous(state, field: str):
+    history = state.attrs[field].history
+    return history.deleted[0] if history.deleted else getattr(state.object, field)
+
+
+@event.listens_for(Friendship, "after_insert")
+def _index_friendship(mapper, connection, target) -> None:
+    if target.status == FriendshipStatus.ACCEPTED:
+        _queue(target, ("add_edge", target.requester_id, target.addressee_id))
+
+
+@event.listens_for(Friendship, "after_update")
+def _reindex_friendship(mapper, connection, target) -> None:
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in ("status", "requester_id", "addressee_id")):
+        return
+
+    was_accepted = _previous(state, "status") == FriendshipStatus.ACCEPTED
+    if was_accepted:
+        _unlink_unless_still_friends(
+            connection, target, _previous(state, "requester_id"), _previous(state, "addressee_id")
+        )
+    if target.status == FriendshipStatus.ACCEPTED:
+        _queue(target, ("add_edge", target.requester_id, target.addressee_id))
+
+
+@event.listens_for(Friendship, "after_delete")
+def _unindex_friendship(mapper, connection, target) -> None:
+    if target.status == FriendshipStatus.ACCEPTED:
+        _unlink_unless_still_friends(connection, target, target.requester_id, target.addressee_id)
+
+
+# Friendships go with their users through ON DELETE CASCADE, which the ORM never sees.
+@event.listens_for(User, "after_delete")
+def _unindex_user(mapper, connection, target) -> None:
+    _queue(target, ("remove_user", target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_friend_graph_changes(session) -> None:
+    # In flush order, so an edge removed and re-added in one transaction ends up present.
+    for change, *args in session.info.pop("friend_graph_changes", ()):
+        getattr(friend_graph, change)(*args)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_friend_graph_changes(session) -> None:
+    session.info.pop("friend_graph_changes", None)
@@ -0,0 +1,116 @@
+"""Vectorized grading of quiz attempts.
+
+A quiz's answer key is two arrays over its questions in position order:
+the correct choice index and the points each question is worth. A batch
+of submissions is an (attempts x questions) matrix of chosen choices,
+with -1 for unanswered. Grading the batch is then one comparison against
+the key and one weighted row sum, with no per-attempt Python loop. A
+single submission is graded as a batch of one. After a key correction,
+`regrade_quiz` re-scores every finished attempt in one pass and writes
+the results back with a single executemany UPDATE.
+"""
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+import uuid
+
+import numpy as np
+from sqlalchemy import func, select, update
+
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.quiz_question import QuizQuestion
+
+UNANSWERED = -1
+
+
+class AnswerKey(NamedTuple):
+    question_ids: List[uuid.UUID]
+    correct: np.ndarray  # int16, one entry per question
+    points: np.ndarray  # int32, one entry per question
+
+    @property
+    def total_points(self) -> int:
+        return int(self.points.sum())
+
+
+class Grades(NamedTuple):
+    points: np.ndarray  # int32 points earned per attempt
+    score: np.ndarray  # float64 percentage of available points per attempt
+    passed: np.ndarray  # bool per attempt
+    correct: np.ndarray  # bool (attempts x questions)
+
+
+def build_answer_key(questions: Iterable) -> AnswerKey:
+    """Key from rows with id, correct_choice and points, in position order."""
+    questions = list(questions)
+    return AnswerKey(
+        question_ids=[question.id for question in questions],
+        correct=np.array([question.correct_choice for question in questions], dtype=np.int16),
+        points=np.array([question.points for question in questions], dtype=np.int32),
+    )
+
+
+def answer_matrix(submissions: Sequence[Optional[Sequence[int]]], question_count: int) -> np.ndarray:
+    """Stack stored answer lists into one matrix, padding short rows with -1."""
+    matrix = np.full((len(submissions), question_count), UNANSWERED, dtype=np.int16)
+    for row, answers in enumerate(submissions):
+        if answers:
+            answers = answers[:question_count]
+            matrix[row, :len(answers)] = answers
+    return matrix
+
+
+def grade(answers: np.ndarray, key: AnswerKey, passing_score: int) -> Grades:
+    """Grade every row of `answers` against `key` at once."""
+    correct = answers == key.correct
+    points = correct.astype(np.int32) @ key.points
+    total = key.total_points
+    if total:
+        score = points * (100.0 / total)
+    else:
+        score = np.zeros(len(answers), dtype=np.float64)
+    return Grades(points=points, score=score, passed=score >= passing_score, correct=correct)
+
+
+async def load_answer_key(db, quiz_id: uuid.UUID) -> AnswerKey:
+    rows = await db.execute(
+        select(QuizQuestion.id, QuizQuestion.correct_choice, QuizQuestion.points)
+        .where(QuizQuestion.quiz_id == quiz_id)
+        .order_by(QuizQuestion.position)
+    )
+    return build_answer_key(rows.all())
+
+
+async def count_attempts(db, quiz_id: uuid.UUID, user_id: uuid.UUID) -> int:
+    """Attempts the user has started; a range scan of the (quiz, user, number) index."""
+    return (await db.execute(
+        select(func.count())
+        .select_from(QuizAttempt)
+        .where(QuizAttempt.quiz_id == quiz_id, QuizAttempt.user_id == user_id)
+    )).scalar_one()
+
+
+async def regrade_quiz(db, quiz: Quiz) -> int:
+    """Re-score every finished attempt of `quiz` against its current key.
+
+    Only the columns grading needs are read. The caller commits.
+    """
+    key = await load_answer_key(db, quiz.id)
+    rows = (await db.execute(
+        select(QuizAttempt.id, QuizAttempt.answers)
+        .where(QuizAttempt.quiz_id == quiz.id, QuizAttempt.finished_at.is_not(None))
+    )).all()
+    if not rows:
+        return 0
+
+    grades = grade(answer_matrix([row.answers for row in rows], len(key.question_ids)), key, quiz.passing_score)
+    # ORM bulk UPDATE by primary key: one executemany statement.
+    await db.execute(
+        update(QuizAttempt),
+        [
+            {"id": row.id, "points": points, "score": score, "passed": passed}
+            for row, points, score, passed in zip(
+                rows, grades.points.tolist(), grades.score.tolist(), grades.passed.tolist()
+            )
+        ],
+    )
+    return len(rows)
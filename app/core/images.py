@@ -0,0 +1,159 @@
+"""Resized image derivatives, rendered off the API workers.
+
+Decoding and resampling are CPU-bound and hold the GIL, so they run in a
+ProcessPoolExecutor. The API process only stores the returned bytes, as
+content-addressed blobs, and records each derivative as an Asset row
+pointing back at its original.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import io
+from pathlib import Path
+from typing import List, Optional, Union
+import uuid
+
+from PIL import Image, ImageOps, features
+
+from app.core.blobs import acquire_or_store_blob
+from app.core.config import IMAGE_WORKERS
+from app.core.storage import storage
+from app.models.assets import Asset
+
+# Target widths; originals narrower than a target don't get that variant.
+VARIANT_WIDTHS = {
+    "thumbnail": 320,
+    "medium": 1024,
+}
+
+
+@dataclass
+class RenderedImage:
+    variant: str
+    data: bytes
+    width: int
+    height: int
+    media_type: str
+    sha256: str
+
+
+@dataclass
+class RenderResult:
+    width: int
+    height: int
+    variants: List[RenderedImage]
+
+
+def render_variants(source: Union[bytes, str, Path]) -> RenderResult:
+    """Decode an image and render every applicable variant (runs in a worker).
+
+    `source` is the encoded image, or a path to it so large uploads are read
+    by the worker rather than shipped over from the API process.
+    """
+    use_webp = features.check("webp")
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as decoded:
+        image = ImageOps.exif_transpose(decoded)
+        rendered = []
+        for variant, target_width in VARIANT_WIDTHS.items():
+            if image.width <= target_width:
+                continue
+
+            target_height = max(1, round(image.height * target_width / image.width))
+            resized = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+            if not use_webp and resized.mode not in ("RGB", "L"):
+                resized = resized.convert("RGB")
+
+            buffer = io.BytesIO()
+            if use_webp:
+                resized.save(buffer, format="WEBP", quality=80, method=4)
+            else:
+                resized.save(buffer, format="JPEG", quality=82, optimize=True, progressive=True)
+            data = buffer.getvalue()
+            rendered.append(RenderedImage(
+                variant=variant,
+                data=data,
+                width=resized.width,
+                height=resized.height,
+                media_type="image/webp" if use_webp else "image/jpeg",
+                sha256=hashlib.sha256(data).hexdigest(),
+            ))
+        return RenderResult(width=image.width, height=image.height, variants=rendered)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """Process pool for rendering, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def _prepare_original(original: Asset, result: RenderResult) -> None:
+    if original.id is None:
+        original.id = uuid.uuid4()
+    original.width = result.width
+    original.height = result.height
+
+
+def _variant_asset(original: Asset, image: RenderedImage, blob) -> Asset:
+    return Asset(
+        post_id=original.post_id,
+        original=original,
+        variant=image.variant,
+        blob_hash=blob.hash,
+        file_url=storage.url_for(blob.storage_key),
+        media_type=blob.media_type,
+        width=image.width,
+        height=image.height,
+    )
+
+
+async def store_variant_assets(db, original: Asset, result: RenderResult) -> List[Asset]:
+    """Store rendered variants and return (unsaved) Asset rows for them.
+
+    Variants are content-addressed blobs, so ones already in storage are
+    not written again; each gets its reference before its Asset exists.
+    The original's own width and height are filled in from the render too.
+    The upload route and the seeder both store through here.
+    """
+    _prepare_original(original, result)
+    assets = []
+    for image in result.variants:
+        blob = await acquire_or_store_blob(db, image.sha256, image.data, image.media_type)
+        assets.append(_variant_asset(original, image, blob))
+    return assets
+
+
+async def create_variant_assets(db, original: Asset, source: Union[bytes, str, Path]) -> List[Asset]:
+    """Render `source` in the process pool, then `store_variant_assets`."""
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(get_image_executor(), render_variants, source)
+    return await store_variant_assets(db, original, result)
+
+
+def pick_variant(family: list, width: Optional[int]):
+    """Pick from one original and its variants (anything with .variant/.width).
+
+    Without a width the original is returned; otherwise the smallest asset at
+    least `width` wide, falling back to the widest one. Unknown widths sort
+    last, since only an unmeasured original can have one.
+    """
+    if width is None:
+        return next((asset for asset in family if asset.variant == "original"), family[0])
+
+    sized = sorted(family, key=lambda asset: asset.width if asset.width is not None else float("inf"))
+    for asset in sized:
+        if asset.width is None or asset.width >= width:
+            return asset
+    return sized[-1]
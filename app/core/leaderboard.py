@@ -0,0 +1,342 @@
+"""Per-quiz leaderboards of each user's best graded attempt.
+
+Ordering every attempt of a quiz per request doesn't scale with attempts.
+Instead, each quiz keeps a list of (-score, time_used_seconds, user_id)
+kept sorted with bisect, plus each user's current key. Top k is a slice.
+A user's rank is one bisect to the first entry with the same score and
+time, so ties share a rank, and the percentile follows from the rank and
+the board size. A graded attempt only re-positions its user's entry, and
+only when it beats their best.
+
+Boards change once the grading (or deleting) commit lands. They are snapshotted to
+LEADERBOARD_SNAPSHOT_PATH periodically and at shutdown. At startup the
+snapshot is restored, and only quizzes with attempts finished or answer
+keys corrected since then are reloaded from the database. Without a
+usable snapshot, every board is rebuilt.
+"""
+import asyncio
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+import os
+from pathlib import Path
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import uuid
+
+import orjson
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import LEADERBOARD_SNAPSHOT_PATH, LEADERBOARD_SNAPSHOT_SECONDS
+from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.quiz_question import QuizQuestion
+from app.models.user import User
+
+SNAPSHOT_VERSION = 1
+
+# Attempts graded just before a snapshot may commit just after it; quizzes
+# touched within this margin of the snapshot are reloaded too.
+SNAPSHOT_CATCH_UP_MARGIN = timedelta(minutes=5)
+
+_Key = Tuple[float, int, uuid.UUID]
+
+
+class LeaderboardEntry(NamedTuple):
+    user_id: uuid.UUID
+    score: float
+    time_used_seconds: int
+    rank: int
+
+
+class Standing(NamedTuple):
+    rank: int
+    # Share of the board ranked at or below this user; the leader is at 100.
+    percentile: float
+    score: float
+    time_used_seconds: int
+    total: int
+
+
+class QuizLeaderboard:
+    """One quiz's best attempt per user, best score first, then least time."""
+
+    def __init__(self):
+        self._ranked: List[_Key] = []
+        self._keys: Dict[uuid.UUID, _Key] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+    def record(self, user_id: uuid.UUID, score: float, time_used_seconds: int) -> bool:
+        """Keep this result if it beats the user's best; returns whether it did."""
+        key = (-score, time_used_seconds, user_id)
+        current = self._keys.get(user_id)
+        if current is not None:
+            if current <= key:
+                return False
+            self._discard(current)
+        insort(self._ranked, key)
+        self._keys[user_id] = key
+        return True
+
+    def remove(self, user_id: uuid.UUID) -> None:
+        key = self._keys.pop(user_id, None)
+        if key is not None:
+            self._discard(key)
+
+    def top(self, k: int) -> List[LeaderboardEntry]:
+        entries = []
+        for position, (neg_score, time_used, user_id) in enumerate(self._ranked[:k]):
+            previous = entries[-1] if entries else None
+            tied = previous is not None and (previous.score, previous.time_used_seconds) == (-neg_score, time_used)
+            rank = previous.rank if tied else position + 1
+            entries.append(LeaderboardEntry(user_id, -neg_score, time_used, rank))
+        return entries
+
+    def standing(self, user_id: uuid.UUID) -> Optional[Standing]:
+        key = self._keys.get(user_id)
+        if key is None:
+            return None
+        # A 2-tuple sorts before every 3-tuple sharing its prefix: the first tie.
+        position = bisect_left(self._ranked, key[:2])
+        total = len(self._ranked)
+        return Standing(
+            rank=position + 1,
+            percentile=100.0 * (total - position) / total,
+            score=-key[0],
+            time_used_seconds=key[1],
+            total=total,
+        )
+
+    def rows(self) -> List[Tuple[str, float, int]]:
+        return [(str(user_id), -neg_score, time_used) for neg_score, time_used, user_id in self._ranked]
+
+    def _discard(self, key: _Key) -> None:
+        position = bisect_left(self._ranked, key)
+        if position < len(self._ranked) and self._ranked[position] == key:
+            del self._ranked[position]
+
+
+class LeaderboardIndex:
+    """Every quiz's leaderboard, with periodic snapshots to disk."""
+
+    def __init__(
+        self,
+        snapshot_path: Path = LEADERBOARD_SNAPSHOT_PATH,
+        snapshot_seconds: float = LEADERBOARD_SNAPSHOT_SECONDS,
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.snapshot_seconds = snapshot_seconds
+        self._boards: Dict[uuid.UUID, QuizLeaderboard] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self, rows: Iterable, quiz_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """Rebuild boards from rows with quiz_id, user_id, score, time_used_seconds.
+
+        With `quiz_ids`, only those boards are replaced; otherwise all of them.
+        """
+        boards: Dict[uuid.UUID, QuizLeaderboard] = {}
+        for row in rows:
+            board = boards.setdefault(row.quiz_id, QuizLeaderboard())
+            board.record(row.user_id, row.score, row.time_used_seconds or 0)
+
+        with self._lock:
+            if quiz_ids is None:
+                self._boards = boards
+                return
+            for quiz_id in quiz_ids:
+                if quiz_id in boards:
+                    self._boards[quiz_id] = boards[quiz_id]
+                else:
+                    self._boards.pop(quiz_id, None)
+
+    def record(self, quiz_id: uuid.UUID, user_id: uuid.UUID, score: float, time_used_seconds: int) -> None:
+        with self._lock:
+            board = self._boards.setdefault(quiz_id, QuizLeaderboard())
+            board.record(user_id, score, time_used_seconds)
+
+    def drop_quiz(self, quiz_id: uuid.UUID) -> None:
+        with self._lock:
+            self._boards.pop(quiz_id, None)
+
+    def remove_user(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            for board in self._boards.values():
+                board.remove(user_id)
+
+    def retain_quizzes(self, quiz_ids: Iterable[uuid.UUID]) -> None:
+        """Drop boards of quizzes not in `quiz_ids`, e.g. deleted while down."""
+        keep = set(quiz_ids)
+        with self._lock:
+            for quiz_id in [quiz_id for quiz_id in self._boards if quiz_id not in keep]:
+                del self._boards[quiz_id]
+
+    def top(self, quiz_id: uuid.UUID, k: int) -> List[LeaderboardEntry]:
+        with self._lock:
+            board = self._boards.get(quiz_id)
+            return board.top(k) if board is not None else []
+
+    def standing(self, quiz_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Standing]:
+        with self._lock:
+            board = self._boards.get(quiz_id)
+            return board.standing(user_id) if board is not None else None
+
+    def size(self, quiz_id: uuid.UUID) -> int:
+        with self._lock:
+            board = self._boards.get(quiz_id)
+            return len(board) if board is not None else 0
+
+    def save_snapshot(self) -> int:
+        """Write every board to the snapshot file atomically; returns the board count."""
+        taken_at = datetime.utcnow()
+        with self._lock:
+            quizzes = {str(quiz_id): board.rows() for quiz_id, board in self._boards.items()}
+
+        payload = orjson.dumps({
+            "version": SNAPSHOT_VERSION,
+            "taken_at": taken_at.isoformat(),
+            "quizzes": quizzes,
+        })
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer: every worker snapshots to the same path.
+        partial = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(partial, "wb") as handle:
+                handle.write(payload)
+            os.replace(partial, self.snapshot_path)
+        finally:
+            partial.unlink(missing_ok=True)
+        return len(quizzes)
+
+    def restore_snapshot(self) -> Optional[datetime]:
+        """Load boards from the snapshot file; returns when it was taken, or None."""
+        try:
+            data = orjson.loads(self.snapshot_path.read_bytes())
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            taken_at = datetime.fromisoformat(data["taken_at"])
+            boards = {}
+            for quiz_id, rows in data["quizzes"].items():
+                board = QuizLeaderboard()
+                for user_id, score, time_used in rows:
+                    board.record(uuid.UUID(user_id), score, time_used)
+                boards[uuid.UUID(quiz_id)] = board
+        except FileNotFoundError:
+            return None
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+            print(f"Error reading leaderboard snapshot: {exc}")
+            return None
+
+        with self._lock:
+            self._boards = boards
+        return taken_at
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_seconds)
+            try:
+                await asyncio.to_thread(self.save_snapshot)
+            except OSError as exc:
+                print(f"Error writing leaderboard snapshot: {exc}")
+
+    def start(self) -> None:
+        """Start the periodic snapshot loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the snapshot loop and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.to_thread(self.save_snapshot)
+        except OSError as exc:
+            print(f"Error writing leaderboard snapshot: {exc}")
+
+
+leaderboards = LeaderboardIndex()
+
+_GRADED_COLUMNS = (
+    QuizAttempt.quiz_id,
+    QuizAttempt.user_id,
+    QuizAttempt.score,
+    QuizAttempt.time_used_seconds,
+)
+
+
+def load_leaderboards(db) -> None:
+    """Restore the snapshot and catch up from the database; run once at startup."""
+    graded = select(*_GRADED_COLUMNS).where(QuizAttempt.finished_at.is_not(None))
+
+    taken_at = leaderboards.restore_snapshot()
+    if taken_at is None:
+        leaderboards.load(db.execute(graded).all())
+        return
+
+    since = taken_at - SNAPSHOT_CATCH_UP_MARGIN
+    changed = set(db.execute(
+        select(QuizAttempt.quiz_id).where(QuizAttempt.finished_at > since).distinct()
+    ).scalars())
+    # Key corrections re-grade old attempts without touching finished_at.
+    changed.update(db.execute(
+        select(QuizQuestion.quiz_id).where(QuizQuestion.updated_at > since).distinct()
+    ).scalars())
+
+    leaderboards.retain_quizzes(db.execute(select(Quiz.id)).scalars())
+    if changed:
+        rows = db.execute(graded.where(QuizAttempt.quiz_id.in_(changed))).all()
+        leaderboards.load(rows, quiz_ids=changed)
+
+
+async def refresh_quiz_leaderboard(db, quiz_id: uuid.UUID) -> None:
+    """Rebuild one quiz's board, e.g. after a re-grade moved scores both ways."""
+    rows = (await db.execute(
+        select(*_GRADED_COLUMNS)
+        .where(QuizAttempt.quiz_id == quiz_id, QuizAttempt.finished_at.is_not(None))
+    )).all()
+    leaderboards.load(rows, quiz_ids=[quiz_id])
+
+
+def _queue(target, change) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("leaderboard_changes", []).append(change)
+
+
+@event.listens_for(QuizAttempt, "after_insert")
+@event.listens_for(QuizAttempt, "after_update")
+def _queue_graded_attempt(mapper, connection, target) -> None:
+    if target.finished_at is None or target.score is None:
+        return
+    if not inspect(target).attrs.score.history.has_changes():
+        return
+    _queue(target, ("record", (target.quiz_id, target.user_id, target.score, target.time_used_seconds or 0)))
+
+
+@event.listens_for(Quiz, "after_delete")
+def _drop_quiz_leaderboard(mapper, connection, target) -> None:
+    _queue(target, ("drop_quiz", (target.id,)))
+
+
+# Attempts go with their users through ON DELETE CASCADE, which the ORM never sees.
+@event.listens_for(User, "after_delete")
+def _unrank_user(mapper, connection, target) -> None:
+    _queue(target, ("remove_user", (target.id,)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_leaderboard_changes(session) -> None:
+    for change, args in session.info.pop("leaderboard_changes", ()):
+        getattr(leaderboards, change)(*args)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_leaderboard_changes(session) -> None:
+    session.info.pop("leaderboard_changes", None)
@@ -0,0 +1,90 @@
+"""Profile read-through cache with negative caching, invalidated by User writes.
+
+A found profile is stored once and reachable under both ("username", name)
+and ("id", uuid). Lookups that found nothing go to a separate, short-lived
+miss cache so scans over unknown usernames stop reaching the database.
+"""
+from typing import Any, Hashable, NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import (
+    PROFILE_CACHE_MAX_ENTRIES,
+    PROFILE_CACHE_TTL_SECONDS,
+    PROFILE_MISS_MAX_ENTRIES,
+    PROFILE_MISS_TTL_SECONDS,
+)
+from app.models.user import User
+
+
+class CachedProfile(NamedTuple):
+    etag: str
+    body: bytes
+    profile: Any  # ShowProfile, kept for callers that merge several profiles
+
+
+profile_cache = TTLCache(
+    max_entries=PROFILE_CACHE_MAX_ENTRIES,
+    ttl_seconds=PROFILE_CACHE_TTL_SECONDS,
+)
+profile_misses = TTLCache(
+    max_entries=PROFILE_MISS_MAX_ENTRIES,
+    ttl_seconds=PROFILE_MISS_TTL_SECONDS,
+)
+
+
+def cache_generation() -> tuple[int, int]:
+    """Read before querying; stale results are then refused by cache_profile/cache_miss."""
+    return profile_cache.generation, profile_misses.generation
+
+
+def get_cached_profile(key: Hashable) -> Optional[CachedProfile]:
+    return profile_cache.get(key)
+
+
+def is_known_missing(key: Hashable) -> bool:
+    return profile_misses.get(key) is not None
+
+
+def cache_profile(entry: CachedProfile, user_id, username: str, generation: tuple[int, int]) -> None:
+    """Store one entry under both of its keys."""
+    profile_cache.set(("id", user_id), entry, generation=generation[0])
+    profile_cache.set(("username", username), entry, generation=generation[0])
+
+
+def cache_miss(key: Hashable, generation: tuple[int, int]) -> None:
+    profile_misses.set(key, True, generation=generation[1])
+
+
+def _keys_for(target: User) -> set:
+    history = inspect(target).attrs.username.history
+    keys = {("id", target.id)}
+    for username in [target.username, *(history.deleted or ())]:
+        keys.add(("username", username))
+    return keys
+
+
+def _invalidate(keys) -> None:
+    for key in keys:
+        profile_cache.pop(key)
+        profile_misses.pop(key)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_profile(mapper, connection, target) -> None:
+    """Drop cached hits and misses for the user, including an old username."""
+    keys = _keys_for(target)
+    _invalidate(keys)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("profile_cache_keys", set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_profile_on_commit(session) -> None:
+    """Drop them again once committed, so reads racing the flush can't keep stale rows."""
+    _invalidate(session.info.pop("profile_cache_keys", ()))
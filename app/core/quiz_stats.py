@@ -0,0 +1,107 @@
+"""Quiz totals for the homepage, kept as running counters.
+
+Counting `quizzes` on every homepage hit is a scan that grows with the
+table. Instead, Quiz mapper events add +1/-1 deltas to rows in
+`stat_counters` within the same flush, so the counts commit or roll back
+together with the quiz writes. Reading them is then two primary-key
+lookups whatever the table size. A recount at startup corrects any drift
+from bulk statements that bypass the ORM.
+
+A quiz counts as published when `is_public` is set; every other quiz is
+a draft.
+"""
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.quiz import Quiz
+from app.models.stat_counter import StatCounter
+
+QUIZZES_TOTAL = "quizzes.total"
+QUIZZES_PUBLISHED = "quizzes.published"
+
+_counters = StatCounter.__table__
+
+
+class QuizStats(NamedTuple):
+    total: int
+    published: int
+
+    @property
+    def drafts(self) -> int:
+        return self.total - self.published
+
+
+async def get_quiz_stats(db) -> QuizStats:
+    """Current totals, read straight off the counter rows."""
+    rows = await db.execute(
+        select(StatCounter.name, StatCounter.value)
+        .where(StatCounter.name.in_([QUIZZES_TOTAL, QUIZZES_PUBLISHED]))
+    )
+    values = dict(rows.all())
+    return QuizStats(
+        total=values.get(QUIZZES_TOTAL, 0),
+        published=values.get(QUIZZES_PUBLISHED, 0),
+    )
+
+
+def reconcile_quiz_stats(db) -> QuizStats:
+    """Recount quizzes and overwrite the counters; run once at startup."""
+    total, published = db.execute(
+        select(
+            func.count(Quiz.id),
+            func.coalesce(func.sum(case((Quiz.is_public == True, 1), else_=0)), 0),
+        )
+    ).one()
+
+    rows = [
+        {"name": QUIZZES_TOTAL, "value": total, "updated_at": datetime.utcnow()},
+        {"name": QUIZZES_PUBLISHED, "value": published, "updated_at": datetime.utcnow()},
+    ]
+    if db.get_bind().dialect.name == "postgresql":
+        statement = postgresql.insert(StatCounter).values(rows)
+    else:
+        statement = sqlite.insert(StatCounter).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at},
+    ))
+    db.commit()
+    return QuizStats(total=total, published=published)
+
+
+def _adjust(connection, name: str, delta: int) -> None:
+    connection.execute(
+        update(_counters)
+        .where(_counters.c.name == name)
+        .values(value=_counters.c.value + delta, updated_at=datetime.utcnow())
+    )
+
+
+def _was_public(target) -> bool:
+    history = inspect(target).attrs.is_public.history
+    return bool(history.deleted[0] if history.deleted else target.is_public)
+
+
+@event.listens_for(Quiz, "after_insert")
+def _count_quiz(mapper, connection, target) -> None:
+    _adjust(connection, QUIZZES_TOTAL, 1)
+    if target.is_public:
+        _adjust(connection, QUIZZES_PUBLISHED, 1)
+
+
+@event.listens_for(Quiz, "after_update")
+def _recount_published(mapper, connection, target) -> None:
+    was_public, is_public = _was_public(target), bool(target.is_public)
+    if was_public != is_public:
+        _adjust(connection, QUIZZES_PUBLISHED, 1 if is_public else -1)
+
+
+@event.listens_for(Quiz, "after_delete")
+def _uncount_quiz(mapper, connection, target) -> None:
+    _adjust(connection, QUIZZES_TOTAL, -1)
+    # A change made in the session before the delete was never flushed.
+    if _was_public(target):
+        _adjust(connection, QUIZZES_PUBLISHED, -1)
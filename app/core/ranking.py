@@ -0,0 +1,177 @@
+"""Popularity ranking for published posts.
+
+Scores follow the Hacker News gravity formula::
+
+    score = (views + LIKE_WEIGHT * likes) / (age_hours + 2) ** GRAVITY
+
+and live in a list kept sorted by score, so serving the top k is a slice.
+Committed writes re-position a single entry with bisect. Because time
+decay shifts every score at once, the whole list is re-scored at most
+once every POPULARITY_RESCORE_SECONDS instead of on each request.
+"""
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+import threading
+import time
+from typing import Iterable, List, Optional
+import uuid
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import (
+    POPULARITY_GRAVITY,
+    POPULARITY_LIKE_WEIGHT,
+    POPULARITY_RESCORE_SECONDS,
+)
+from app.models.post import Post
+
+
+@dataclass
+class _Entry:
+    created_at: datetime
+    views: int
+    likes: int
+    score: float
+
+
+class PopularityIndex:
+    """Incrementally maintained ranking of posts by decayed engagement."""
+
+    def __init__(
+        self,
+        gravity: float = POPULARITY_GRAVITY,
+        like_weight: float = POPULARITY_LIKE_WEIGHT,
+        rescore_seconds: float = POPULARITY_RESCORE_SECONDS,
+    ):
+        self.gravity = gravity
+        self.like_weight = like_weight
+        self.rescore_seconds = rescore_seconds
+        self._entries: dict[uuid.UUID, _Entry] = {}
+        # Sorted ascending by (-score, id), i.e. most popular first.
+        self._ranked: List[tuple[float, uuid.UUID]] = []
+        self._lock = threading.Lock()
+        self._scored_at = time.monotonic()
+
+    def score(self, views: int, likes: int, created_at: datetime, now: Optional[datetime] = None) -> float:
+        """Gravity-decayed score for a post with the given counts."""
+        now = now or datetime.utcnow()
+        age_hours = max((now - created_at).total_seconds() / 3600.0, 0.0)
+        points = views + self.like_weight * likes
+        return points / (age_hours + 2.0) ** self.gravity
+
+    def load(self, rows: Iterable) -> None:
+        """Replace the index from rows with id, created_at, view_count, like_count."""
+        now = datetime.utcnow()
+        with self._lock:
+            self._entries = {
+                row.id: _Entry(
+                    created_at=row.created_at,
+                    views=row.view_count or 0,
+                    likes=row.like_count or 0,
+                    score=self.score(row.view_count or 0, row.like_count or 0, row.created_at, now),
+                )
+                for row in rows
+            }
+            self._rebuild()
+
+    def upsert(self, post_id: uuid.UUID, created_at: datetime, views: int, likes: int) -> None:
+        """Insert or re-rank a single post.
+
+        An indexed post keeps its own counts: views reach the index through
+        `add_views` ahead of the row, so the ORM's copy may be older.
+        """
+        with self._lock:
+            current = self._entries.get(post_id)
+            if current is not None:
+                views, likes = current.views, current.likes
+            self._discard(post_id)
+            entry = _Entry(created_at, views, likes, self.score(views, likes, created_at))
+            self._entries[post_id] = entry
+            insort(self._ranked, (-entry.score, post_id))
+
+    def add_views(self, post_id: uuid.UUID, delta: int) -> None:
+        """Bump the view count of an indexed post and re-rank it."""
+        with self._lock:
+            entry = self._entries.get(post_id)
+            if entry is None:
+                return
+            self._discard(post_id)
+            entry.views += delta
+            entry.score = self.score(entry.views, entry.likes, entry.created_at)
+            self._entries[post_id] = entry
+            insort(self._ranked, (-entry.score, post_id))
+
+    def remove(self, post_id: uuid.UUID) -> None:
+        """Drop a post from the ranking (deleted or unpublished)."""
+        with self._lock:
+            self._discard(post_id)
+
+    def top(self, k: int) -> List[uuid.UUID]:
+        """Ids of the k most popular posts, most popular first."""
+        with self._lock:
+            if time.monotonic() - self._scored_at > self.rescore_seconds:
+                now = datetime.utcnow()
+                for entry in self._entries.values():
+                    entry.score = self.score(entry.views, entry.likes, entry.created_at, now)
+                self._rebuild()
+
+            return [post_id for _, post_id in self._ranked[:k]]
+
+    def _discard(self, post_id: uuid.UUID) -> None:
+        entry = self._entries.pop(post_id, None)
+        if entry is None:
+            return
+        position = bisect_left(self._ranked, (-entry.score, post_id))
+        if position < len(self._ranked) and self._ranked[position][1] == post_id:
+            del self._ranked[position]
+
+    def _rebuild(self) -> None:
+        self._ranked = sorted((-entry.score, post_id) for post_id, entry in self._entries.items())
+        self._scored_at = time.monotonic()
+
+
+popularity_index = PopularityIndex()
+
+
+def load_popularity_index(db) -> None:
+    """Build the ranking from every published post; run once at startup."""
+    rows = db.execute(
+        select(Post.id, Post.created_at, Post.view_count, Post.like_count)
+        .where(Post.is_published == True)
+    ).all()
+    popularity_index.load(rows)
+
+
+def _queue(target, change) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("ranking_changes", []).append(change)
+
+
+# Queued at flush and applied once the commit lands, so a rolled back
+# write never reaches the ranking.
+@event.listens_for(Post, "after_insert")
+@event.listens_for(Post, "after_update")
+def _rank_post(mapper, connection, target) -> None:
+    if target.is_published:
+        _queue(target, ("upsert", (target.id, target.created_at, target.view_count or 0, target.like_count or 0)))
+    else:
+        _queue(target, ("remove", (target.id,)))
+
+
+@event.listens_for(Post, "after_delete")
+def _unrank_post(mapper, connection, target) -> None:
+    _queue(target, ("remove", (target.id,)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_ranking_changes(session) -> None:
+    for change, args in session.info.pop("ranking_changes", ()):
+        getattr(popularity_index, change)(*args)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_ranking_changes(session) -> None:
+    session.info.pop("ranking_changes", None)
@@ -0,0 +1,174 @@
+"""Full-text search over posts with a backend picked from DATABASE_URL.
+
+Postgres ranks against a stored, weighted `search_vector` tsvector column
+with a GIN index, added by migration (or by `init_db` on fresh databases).
+Postgres maintains both itself on every write. SQLite uses an FTS5 table,
+`posts_fts`, keyed by the posts rowid. It is created by `init_db` and kept
+in sync from Post mapper events one row at a time.
+"""
+from abc import ABC, abstractmethod
+
+from sqlalchemy import column, event, func, inspect, literal_column, select, table, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import DATABASE_URL
+from app.models.post import Post
+
+# Columns returned with every hit; the feed never needs Post.content.
+_RESULT_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.excerpt,
+    Post.created_at,
+    Post.author_id,
+    Post.image_url,
+)
+
+
+class SearchBackend(ABC):
+    """Interface for post search backends."""
+
+    def setup(self, connection) -> None:
+        """Create backend-specific structures if they are missing."""
+
+    @abstractmethod
+    def search_statement(self, query: str, limit: int):
+        """Select of the result columns plus a `rank` (higher is better)."""
+
+    def index_post(self, connection, post: Post) -> None:
+        """Add or refresh one post in the index."""
+
+    def remove_post(self, connection, post: Post) -> None:
+        """Remove one post from the index."""
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector + GIN; the generated column keeps itself current."""
+
+    def setup(self, connection) -> None:
+        # Same DDL as the migration, for databases built with create_all.
+        # Checked first: even a no-op ALTER TABLE or CREATE INDEX locks
+        # `posts`, and this runs in every worker on every start.
+        has_column = connection.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'posts' "
+            "AND column_name = 'search_vector'"
+        )).first()
+        if not has_column:
+            connection.execute(text(
+                "ALTER TABLE posts ADD COLUMN search_vector tsvector "
+                "GENERATED ALWAYS AS ("
+                "setweight(to_tsvector('simple', coalesce(title, '')), 'A') "
+                "|| setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B') "
+                "|| setweight(to_tsvector('simple', coalesce(content, '')), 'C')"
+                ") STORED"
+            ))
+        if connection.execute(text("SELECT to_regclass('ix_posts_search_vector')")).scalar() is None:
+            connection.execute(text(
+                "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)"
+            ))
+
+    def search_statement(self, query: str, limit: int):
+        tsquery = func.websearch_to_tsquery("simple", query)
+        vector = literal_column("posts.search_vector")
+        rank = func.ts_rank_cd(vector, tsquery)
+        return (
+            select(*_RESULT_COLUMNS, rank.label("rank"))
+            .where(Post.is_published == True, vector.op("@@")(tsquery))
+            .order_by(rank.desc(), Post.created_at.desc())
+            .limit(limit)
+        )
+
+
+class SqliteSearchBackend(SearchBackend):
+    """FTS5 table keyed by the posts rowid, maintained from ORM writes."""
+
+    _fts = table("posts_fts", column("rowid"))
+
+    def setup(self, connection) -> None:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+        ).first()
+        if exists:
+            return
+
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE posts_fts USING fts5("
+            "title, excerpt, content, tokenize = 'unicode61')"
+        ))
+        # One-off backfill for posts written before the index existed.
+        connection.execute(text(
+            "INSERT INTO posts_fts (rowid, title, excerpt, content) "
+            "SELECT rowid, title, coalesce(excerpt, ''), content FROM posts"
+        ))
+
+    def search_statement(self, query: str, limit: int):
+        # Quote every term so user input can't inject FTS5 query syntax.
+        terms = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+        # bm25 is lower-is-better; weights are title, excerpt, content.
+        bm25 = func.bm25(literal_column("posts_fts"), 10.0, 4.0, 1.0)
+        return (
+            select(*_RESULT_COLUMNS, (-bm25).label("rank"))
+            .join_from(Post, self._fts, literal_column("posts.rowid") == self._fts.c.rowid)
+            .where(
+                Post.is_published == True,
+                literal_column("posts_fts").op("MATCH")(terms),
+            )
+            .order_by(bm25, Post.created_at.desc())
+            .limit(limit)
+        )
+
+    def index_post(self, connection, post: Post) -> None:
+        self.remove_post(connection, post)
+        connection.execute(
+            text(
+                "INSERT INTO posts_fts (rowid, title, excerpt, content) "
+                "SELECT rowid, :title, :excerpt, :content FROM posts WHERE id = :post_id"
+            ),
+            {
+                "post_id": post.id.hex,
+                "title": post.title,
+                "excerpt": post.excerpt or "",
+                "content": post.content,
+            },
+        )
+
+    def remove_post(self, connection, post: Post) -> None:
+        connection.execute(
+            text(
+                "DELETE FROM posts_fts "
+                "WHERE rowid = (SELECT rowid FROM posts WHERE id = :post_id)"
+            ),
+            {"post_id": post.id.hex},
+        )
+
+
+def get_search_backend(database_url: str = DATABASE_URL) -> SearchBackend:
+    """Pick the backend matching the configured database."""
+    if make_url(database_url).get_backend_name() == "postgresql":
+        return PostgresSearchBackend()
+    return SqliteSearchBackend()
+
+
+search_backend = get_search_backend()
+
+
+_INDEXED_FIELDS = ("title", "excerpt", "content")
+
+
+@event.listens_for(Post, "after_insert")
+def _index_new_post(mapper, connection, target) -> None:
+    search_backend.index_post(connection, target)
+
+
+@event.listens_for(Post, "after_update")
+def _reindex_post(mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _INDEXED_FIELDS):
+        search_backend.index_post(connection, target)
+
+
+# Before the DELETE runs, while the posts rowid can still be looked up.
+@event.listens_for(Post, "before_delete")
+def _unindex_post(mapper, connection, target) -> None:
+    search_backend.remove_post(connection, target)
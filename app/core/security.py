@@ -0,0 +1,206 @@
+"""Local verification of Supabase access tokens.
+
+Checking a token with Supabase Auth costs a network round trip per
+request. Instead, signatures are checked here against the project's
+signing keys: the JWKS for asymmetric tokens and SUPABASE_JWT_SECRET for
+legacy HS256 ones. Expiry, audience and issuer are checked too. The JWKS
+is cached and refreshed in the background, and also re-fetched (rate
+limited) when a token names a key id it hasn't seen, so key rotation
+works without a restart.
+
+Local checks can't see a session that was revoked before its token
+expired. Routes where that matters also confirm the token with Supabase;
+see `get_verified_user` in `app.core.deps`.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+import uuid
+
+import httpx
+import jwt
+
+from app.core.config import (
+    JWKS_REFRESH_SECONDS,
+    JWT_LEEWAY_SECONDS,
+    SUPABASE_JWKS_URL,
+    SUPABASE_JWT_AUDIENCE,
+    SUPABASE_JWT_ISSUER,
+    SUPABASE_JWT_SECRET,
+    SUPABASE_KEY,
+)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+# Shortest gap between refreshes forced by unknown key ids, so a flood of
+# forged tokens can't turn into a flood of JWKS requests.
+MIN_FORCED_REFRESH_SECONDS = 30.0
+
+
+class TokenError(Exception):
+    """Raised for any token that fails verification."""
+
+
+class AuthenticatedUser(NamedTuple):
+    id: uuid.UUID
+    email: Optional[str]
+    role: Optional[str]
+    claims: dict[str, Any]
+
+
+class JWKSCache:
+    """Signing keys by key id, fetched from a JWKS endpoint."""
+
+    def __init__(
+        self,
+        url: Optional[str] = SUPABASE_JWKS_URL,
+        api_key: Optional[str] = SUPABASE_KEY,
+        refresh_seconds: float = JWKS_REFRESH_SECONDS,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.refresh_seconds = refresh_seconds
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._fetched_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        """Fetch the key set and replace the cached keys."""
+        if not self.url:
+            return
+        headers = {"apikey": self.api_key} if self.api_key else None
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(self.url, headers=headers)
+            response.raise_for_status()
+            payload = response.json()
+
+        keys = {}
+        for data in payload.get("keys", []):
+            try:
+                key = jwt.PyJWK(data)
+            except jwt.PyJWKError as exc:
+                # Skip keys this build can't use (e.g. an unsupported curve).
+                print(f"Error loading signing key {data.get('kid')}: {exc}")
+                continue
+            if key.key_id:
+                keys[key.key_id] = key
+
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+    async def get_key(self, key_id: str) -> Optional[jwt.PyJWK]:
+        """Key for `key_id`, re-fetching once if it's unknown (rate limited)."""
+        with self._lock:
+            key = self._keys.get(key_id)
+        if key is not None:
+            return key
+
+        async with self._refresh_lock:
+            with self._lock:
+                key = self._keys.get(key_id)
+                fetched_at = self._fetched_at
+            if key is not None:
+                return key
+            if fetched_at is None or time.monotonic() - fetched_at >= MIN_FORCED_REFRESH_SECONDS:
+                try:
+                    await self.refresh()
+                except httpx.HTTPError as exc:
+                    print(f"Error refreshing JWKS: {exc}")
+
+        with self._lock:
+            return self._keys.get(key_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Error refreshing JWKS: {exc}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        """Start the periodic refresh loop on the running event loop."""
+        if self._task is None and self.url:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class TokenVerifier:
+    """Checks signature, expiry, audience and issuer without calling Supabase."""
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        secret: Optional[str] = SUPABASE_JWT_SECRET,
+        audience: Optional[str] = SUPABASE_JWT_AUDIENCE,
+        issuer: Optional[str] = SUPABASE_JWT_ISSUER,
+        leeway: float = JWT_LEEWAY_SECONDS,
+    ):
+        self.jwks = jwks
+        self.secret = secret
+        self.audience = audience
+        self.issuer = issuer
+        self.leeway = leeway
+
+    async def verify(self, token: str) -> AuthenticatedUser:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as exc:
+            raise TokenError("Malformed token") from exc
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.secret:
+                raise TokenError("HS256 tokens are not accepted")
+            key = self.secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key_id = header.get("kid")
+            signing_key = await self.jwks.get_key(key_id) if key_id else None
+            if signing_key is None:
+                raise TokenError("Unknown signing key")
+            key = signing_key.key
+        else:
+            raise TokenError("Unsupported signing algorithm")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={
+                    "require": ["exp", "sub"],
+                    "verify_aud": self.audience is not None,
+                    "verify_iss": self.issuer is not None,
+                },
+            )
+            user_id = uuid.UUID(claims["sub"])
+        except (jwt.PyJWTError, ValueError) as exc:
+            raise TokenError(str(exc)) from exc
+
+        return AuthenticatedUser(
+            id=user_id,
+            email=claims.get("email"),
+            role=claims.get("role"),
+            claims=claims,
+        )
+
+
+jwks_cache = JWKSCache()
+token_verifier = TokenVerifier(jwks_cache)
@@ -0,0 +1,20 @@
+"""Fast JSON encoding for hot routes that serve pre-serialized bytes."""
+from typing import Any, Optional
+
+from fastapi import Response
+import orjson
+from pydantic import BaseModel
+
+
+def dumps(content: Any) -> bytes:
+    """Encode a pydantic model (or plain data) to compact JSON bytes."""
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    # orjson encodes datetime and UUID natively, no jsonable_encoder pass.
+    return orjson.dumps(content)
+
+
+def json_response(body: bytes, etag: Optional[str] = None) -> Response:
+    """Wrap already-encoded JSON so FastAPI skips validation and re-encoding."""
+    headers = {"ETag": etag} if etag else None
+    return Response(content=body, media_type="application/json", headers=headers)
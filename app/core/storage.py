@@ -0,0 +1,237 @@
+"""Blob storage for uploaded media.
+
+Two backends share one interface: `LocalStorage` writes under MEDIA_ROOT
+(served by the app at MEDIA_URL) and `SupabaseStorage` talks to the
+Supabase Storage REST API. Uploads go through `save_stream`, which consumes
+an async iterator of chunks, so a request body never has to be held in
+memory whole.
+"""
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Optional
+import uuid
+
+import httpx
+
+from app.core.config import (
+    MEDIA_ROOT,
+    MEDIA_URL,
+    STORAGE_BACKEND,
+    SUPABASE_KEY,
+    SUPABASE_STORAGE_BUCKET,
+    SUPABASE_URL,
+)
+
+
+class UploadTooLarge(Exception):
+    """Raised while streaming once a body passes its size limit."""
+
+
+class HashingStream:
+    """Re-chunks an async byte stream into fixed-size pieces while hashing it.
+
+    Iterate it to pass the body along; `sha256` and `size` are final once
+    iteration finishes. At most one chunk plus one incoming piece is buffered.
+    """
+
+    def __init__(self, source: AsyncIterable[bytes], chunk_size: int, max_bytes: Optional[int] = None):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        buffer = bytearray()
+        async for piece in self.source:
+            if not piece:
+                continue
+            self.size += len(piece)
+            if self.max_bytes is not None and self.size > self.max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+
+            self._digest.update(piece)
+            buffer += piece
+            while len(buffer) >= self.chunk_size:
+                yield bytes(buffer[: self.chunk_size])
+                del buffer[: self.chunk_size]
+
+        if buffer:
+            yield bytes(buffer)
+
+
+class StorageBackend(ABC):
+    """Interface for blob storage backends."""
+
+    @abstractmethod
+    def save(self, key: str, data: bytes, media_type: str = "application/octet-stream") -> str:
+        """Write a blob held in memory and return its public URL."""
+
+    @abstractmethod
+    async def save_stream(self, key: str, chunks: AsyncIterable[bytes], media_type: str) -> str:
+        """Write a blob from an async chunk iterator and return its public URL."""
+
+    @abstractmethod
+    async def move(self, source_key: str, target_key: str) -> str:
+        """Rename a stored blob and return its new public URL."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a blob; missing keys are ignored."""
+
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        """Public URL of a stored blob."""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path of a stored blob, for backends that have one."""
+        return None
+
+    async def aclose(self) -> None:
+        """Release any pooled connections."""
+
+
+class LocalStorage(StorageBackend):
+    """Stores blobs as files under `root` and serves them from `base_url`."""
+
+    def __init__(self, root: Path = MEDIA_ROOT, base_url: str = MEDIA_URL):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def save(self, key: str, data: bytes, media_type: str = "application/octet-stream") -> str:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return self.url_for(key)
+
+    async def save_stream(self, key: str, chunks: AsyncIterable[bytes], media_type: str) -> str:
+        path = self.root / key
+        # Write to a sibling temp file so readers never see a partial blob.
+        partial = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+
+        handle = await asyncio.to_thread(open, partial, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            handle.close()
+            partial.unlink(missing_ok=True)
+            raise
+        return self.url_for(key)
+
+    async def move(self, source_key: str, target_key: str) -> str:
+        target = self.root / target_key
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(os.replace, self.root / source_key, target)
+        return self.url_for(target_key)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread((self.root / key).unlink, missing_ok=True)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self.root / key
+
+
+class SupabaseStorage(StorageBackend):
+    """Supabase Storage bucket; streamed uploads go out with chunked transfer encoding."""
+
+    def __init__(
+        self,
+        url: Optional[str] = SUPABASE_URL,
+        key: Optional[str] = SUPABASE_KEY,
+        bucket: str = SUPABASE_STORAGE_BUCKET,
+    ):
+        self.url = (url or "").rstrip("/")
+        self.key = key
+        self.bucket = bucket
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _headers(self, media_type: Optional[str] = None) -> dict:
+        if not self.url or not self.key:
+            raise ValueError(
+                "Supabase credentials not configured. "
+                "Set SUPABASE_URL and SUPABASE_KEY environment variables."
+            )
+        headers = {"Authorization": f"Bearer {self.key}", "apikey": self.key, "x-upsert": "true"}
+        if media_type:
+            headers["Content-Type"] = media_type
+        return headers
+
+    def _object_url(self, key: str) -> str:
+        return f"{self.url}/storage/v1/object/{self.bucket}/{key}"
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=120.0))
+        return self._client
+
+    def save(self, key: str, data: bytes, media_type: str = "application/octet-stream") -> str:
+        response = httpx.post(
+            self._object_url(key),
+            content=data,
+            headers=self._headers(media_type),
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        return self.url_for(key)
+
+    async def save_stream(self, key: str, chunks: AsyncIterable[bytes], media_type: str) -> str:
+        response = await self.client.post(
+            self._object_url(key),
+            content=chunks,
+            headers=self._headers(media_type),
+        )
+        response.raise_for_status()
+        return self.url_for(key)
+
+    async def move(self, source_key: str, target_key: str) -> str:
+        response = await self.client.post(
+            f"{self.url}/storage/v1/object/move",
+            json={"bucketId": self.bucket, "sourceKey": source_key, "destinationKey": target_key},
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+        return self.url_for(target_key)
+
+    async def delete(self, key: str) -> None:
+        response = await self.client.request(
+            "DELETE",
+            f"{self.url}/storage/v1/object/{self.bucket}",
+            json={"prefixes": [key]},
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+
+    def url_for(self, key: str) -> str:
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{key}"
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def get_storage_backend(name: str = STORAGE_BACKEND) -> StorageBackend:
+    """Pick the configured storage backend."""
+    if name == "supabase":
+        return SupabaseStorage()
+    if name == "local":
+        return LocalStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {name!r}")
+
+
+storage = get_storage_backend()
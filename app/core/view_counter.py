@@ -0,0 +1,143 @@
+"""Write-behind buffer for post view and impression counts.
+
+Reads only bump an in-memory counter. Pending deltas are written back as
+one batched UPDATE per flush, so hot posts never serialize request
+handling on their row lock. A view is a post's detail page being read;
+an impression is the post being listed on the homepage. Only views feed
+the popularity ranking, since the homepage lists the popular posts and
+counting those listings would keep reinforcing the ranking.
+"""
+import asyncio
+from collections import Counter
+import threading
+from typing import Iterable, Optional, Set
+import uuid
+
+from sqlalchemy import Integer, column, update, values
+
+from app.core.config import VIEW_FLUSH_INTERVAL_SECONDS, VIEW_FLUSH_THRESHOLD
+from app.core.ranking import popularity_index
+from app.db.session import async_engine
+from app.models.post import Post
+
+
+class ViewCounter:
+    """Buffers per-post view and impression deltas and flushes them in batches."""
+
+    def __init__(
+        self,
+        flush_interval: float = VIEW_FLUSH_INTERVAL_SECONDS,
+        flush_threshold: int = VIEW_FLUSH_THRESHOLD,
+    ):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._views: Counter = Counter()
+        self._impressions: Counter = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._early_flush_scheduled = False
+        # Early flushes in flight; the loop only keeps weak references to tasks.
+        self._flushes: Set[asyncio.Task] = set()
+
+    def record(self, post_id: uuid.UUID, views: int = 1) -> None:
+        """Count detail-page views for a post."""
+        self._add(self._views, [post_id], views)
+
+    def record_impressions(self, post_ids: Iterable[uuid.UUID]) -> None:
+        """Count one homepage listing for each post."""
+        self._add(self._impressions, post_ids, 1)
+
+    def _add(self, pending: Counter, post_ids: Iterable[uuid.UUID], count: int) -> None:
+        """Buffer counts; schedules an early flush past the threshold."""
+        with self._lock:
+            for post_id in post_ids:
+                pending[post_id] += count
+                self._pending_total += count
+            schedule = (
+                self._pending_total >= self.flush_threshold
+                and not self._early_flush_scheduled
+                and self._task is not None
+            )
+            if schedule:
+                self._early_flush_scheduled = True
+
+        if schedule:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    def _drain(self) -> tuple[Counter, Counter]:
+        with self._lock:
+            views, self._views = self._views, Counter()
+            impressions, self._impressions = self._impressions, Counter()
+            self._pending_total = 0
+            self._early_flush_scheduled = False
+        return views, impressions
+
+    async def flush(self) -> int:
+        """Write all pending deltas in one statement; returns the rows touched."""
+        async with self._flush_lock:
+            views, impressions = self._drain()
+            post_ids = sorted(views.keys() | impressions.keys())
+            if not post_ids:
+                return 0
+
+            # Sorted ids give concurrent workers the same row-lock order.
+            deltas = values(
+                column("id", Post.id.type),
+                column("views", Integer),
+                column("impressions", Integer),
+                name="v",
+            ).data([(post_id, views[post_id], impressions[post_id]) for post_id in post_ids]).cte("v")
+            statement = (
+                update(Post)
+                .add_cte(deltas)
+                .where(Post.id == deltas.c.id)
+                .values(
+                    view_count=Post.view_count + deltas.c.views,
+                    impression_count=Post.impression_count + deltas.c.impressions,
+                    # Views are not edits; keep onupdate from bumping updated_at.
+                    updated_at=Post.updated_at,
+                )
+            )
+
+            try:
+                async with async_engine.begin() as connection:
+                    await connection.execute(statement)
+            except Exception as exc:
+                print(f"Error flushing view counts: {exc}")
+                with self._lock:
+                    self._views.update(views)
+                    self._impressions.update(impressions)
+                    self._pending_total += sum(views.values()) + sum(impressions.values())
+                return 0
+
+            for post_id, delta in views.items():
+                popularity_index.add_views(post_id, delta)
+            return len(post_ids)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+view_counter = ViewCounter()
@@ -1,17 +1,27 @@
+from app.core.autocomplete import autocomplete_backend
+from app.core.search import search_backend
 from app.db.session import engine
 from app.db.base import Base
 # Import all models to ensure they're registered with Base
 from app.models.user import User
 from app.models.post import Post
 from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.quiz_question import QuizQuestion
 from app.models.admin import Admin
 from app.models.friendship import Friendship
 from app.models.assets import Asset
+from app.models.blob import Blob
+from app.models.stat_counter import StatCounter
 
 
 def init_db() -> None:
     # Create all tables defined in models
     Base.metadata.create_all(bind=engine)
+    # Backend-specific search structures (SQLite FTS5 table, pg_trgm indexes)
+    with engine.begin() as connection:
+        search_backend.setup(connection)
+        autocomplete_backend.setup(connection)
     print("Database tables created/verified successfully.")
 
 
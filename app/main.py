@@ -1,10 +1,24 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 import uvicorn
 
 from app.api.routes import homepage, login
-from app.api.routes import profile
+from app.api.routes import assets, friends, posts, profile, quizzes
+from app.core.auth_service import async_supabase_auth
+from app.core.autocomplete import autocomplete_backend
+from app.core.blobs import schedule_blob_collection
+from app.core.config import MEDIA_ROOT, MEDIA_URL
+from app.core.friend_graph import load_friend_graph
+from app.core.images import shutdown_image_executor
+from app.core.leaderboard import leaderboards, load_leaderboards
+from app.core.quiz_stats import reconcile_quiz_stats
+from app.core.ranking import load_popularity_index
+from app.core.security import jwks_cache
+from app.core.storage import storage
+from app.core.view_counter import view_counter
 from app.db.init_db import init_db
+from app.db.session import SessionLocal
 
 app = FastAPI(
     title="My FastAPI Application",
@@ -23,6 +37,11 @@ app.add_middleware(
 app.include_router(homepage.router, prefix="/homepage", tags=["Homepage"])
 app.include_router(login.router, prefix="/auth", tags=["Auth"])
 app.include_router(profile.router, prefix="/profile", tags=["Profile"])
+app.include_router(friends.router, prefix="/friends", tags=["Friends"])
+app.include_router(posts.router, prefix="/posts", tags=["Posts"])
+app.include_router(assets.router, prefix="/assets", tags=["Assets"])
+app.include_router(quizzes.router, prefix="/quizzes", tags=["Quizzes"])
+app.mount(MEDIA_URL, StaticFiles(directory=MEDIA_ROOT, check_dir=False), name="media")
 
 
 @app.on_event("startup")
@@ -30,6 +49,33 @@ def on_startup() -> None:
     """Initialize database on startup."""
     init_db()
 
+    db = SessionLocal()
+    try:
+        load_popularity_index(db)
+        autocomplete_backend.load(db)
+        load_friend_graph(db)
+        reconcile_quiz_stats(db)
+        load_leaderboards(db)
+    finally:
+        db.close()
+
+    view_counter.start()
+    jwks_cache.start()
+    leaderboards.start()
+    # Recount blob references and drop anything left unreferenced.
+    schedule_blob_collection()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Flush buffered view counts, stop background workers and close HTTP clients before exit."""
+    await view_counter.stop()
+    await jwks_cache.stop()
+    await leaderboards.stop()
+    shutdown_image_executor()
+    await storage.aclose()
+    await async_supabase_auth.aclose()
+
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,16 +1,24 @@
 from app.models.admin import Admin
 from app.models.assets import Asset
+from app.models.blob import Blob
 from app.models.friendship import Friendship, FriendshipStatus
 from app.models.post import Post
 from app.models.quiz import Quiz
+from app.models.quiz_attempt import QuizAttempt
+from app.models.quiz_question import QuizQuestion
+from app.models.stat_counter import StatCounter
 from app.models.user import User
 
 __all__ = [
     "Admin",
     "Asset",
+    "Blob",
     "Friendship",
     "FriendshipStatus",
     "Post",
     "Quiz",
+    "QuizAttempt",
+    "QuizQuestion",
+    "StatCounter",
     "User",
 ]
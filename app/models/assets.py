@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -15,11 +15,36 @@ class Asset(Base):
     post_id = Column(
         UUID(as_uuid=True),
         ForeignKey("posts.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     file_url = Column(String, nullable=False)
     media_type = Column(String, nullable=False, index=True)
+    # "original" for uploads; resized derivatives point back at their original.
+    variant = Column(String(20), default="original", server_default="original", nullable=False)
+    original_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("assets.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True
+    )
+    # Content-addressed object backing this asset; null for assets stored before dedup.
+    blob_hash = Column(
+        String(64),
+        ForeignKey("blobs.hash"),
+        nullable=True,
+        index=True
+    )
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    post = relationship("Post", back_populates="assets")
\ No newline at end of file
+    post = relationship("Post", back_populates="assets")
+    # Lets a flush delete variants before their original.
+    original = relationship("Asset", back_populates="variants", remote_side="Asset.id")
+    variants = relationship("Asset", back_populates="original", passive_deletes=True)
+
+    # Per-post asset lists come back already in created_at order; this also
+    # covers the post_id foreign key lookups the old single-column index served.
+    __table_args__ = (
+        Index("ix_assets_post_created", "post_id", "created_at"),
+    )
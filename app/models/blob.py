@@ -0,0 +1,21 @@
+"""Content-addressed blob model for uploaded media."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from app.db.base import Base
+
+
+class Blob(Base):
+    """One stored object, shared by every Asset with identical content."""
+
+    __tablename__ = "blobs"
+
+    # Hex SHA-256 of the content; also names the object in storage.
+    hash = Column(String(64), primary_key=True)
+    storage_key = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    media_type = Column(String, nullable=False)
+    # Assets pointing at this blob; it is deleted from storage once this drops to 0.
+    ref_count = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -3,7 +3,7 @@ from datetime import datetime
 import enum
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, UniqueConstraint
+from sqlalchemy import Column, DateTime, Enum, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship
@@ -28,14 +28,12 @@ class Friendship(Base):
     requester_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     addressee_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     status = Column(
         Enum(FriendshipStatus),
@@ -58,4 +56,9 @@ class Friendship(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint("requester_id", "addressee_id", name="unique_friendship"),
+        # Friend lists and request inboxes from either side:
+        # WHERE <side>_id = ? AND status = ? ORDER BY created_at DESC is one
+        # range scan. The leading column also covers the foreign key lookups.
+        Index("ix_friendships_requester_status_created", "requester_id", "status", "created_at"),
+        Index("ix_friendships_addressee_status_created", "addressee_id", "status", "created_at"),
     )
\ No newline at end of file
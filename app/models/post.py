@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, desc
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -42,6 +42,25 @@ class Post(Base):
         Text, 
         nullable=True
     )  
+    view_count = Column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
+    like_count = Column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
+    # Homepage listings; kept apart from view_count, which feeds popularity.
+    impression_count = Column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False
+    )
     created_at = Column(
         DateTime, 
         default=datetime.utcnow, 
@@ -62,5 +81,12 @@ class Post(Base):
     assets = relationship(
         "Asset", 
         back_populates="post", 
-        cascade="all, delete-orphan"
-    )
\ No newline at end of file
+        cascade="all, delete-orphan",
+        order_by="Asset.created_at"
+    )
+
+    # Indexes
+    __table_args__ = (
+        # Keyset feed pagination: WHERE is_published ORDER BY created_at DESC, id DESC
+        Index("ix_posts_feed", "is_published", desc("created_at"), desc("id")),
+    )
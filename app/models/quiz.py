@@ -41,5 +41,15 @@ class Quiz(Base):
 
     # Relationships
     author = relationship("User", back_populates="quizzes")
-    # Removed QuizQuestion relationship since we're not using quizzes yet
-    # questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan")
\ No newline at end of file
+    questions = relationship(
+        "QuizQuestion",
+        back_populates="quiz",
+        cascade="all, delete-orphan",
+        order_by="QuizQuestion.position",
+    )
+    attempts = relationship(
+        "QuizAttempt",
+        back_populates="quiz",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""Quiz attempt model for Supabase database."""
+from datetime import datetime
+import uuid
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class QuizAttempt(Base):
+    """One user's attempt at a quiz, graded on submission."""
+
+    __tablename__ = "quiz_attempts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    quiz_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("quizzes.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    # 1-based per (quiz, user); unique, so concurrent starts can't both take the last slot.
+    attempt_number = Column(Integer, nullable=False)
+    # Chosen choice index per question in position order; -1 for unanswered.
+    answers = Column(JSON, nullable=True)
+    points = Column(Integer, nullable=True)
+    score = Column(Float, nullable=True)  # Percentage of available points
+    passed = Column(Boolean, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True, index=True)
+    time_used_seconds = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    quiz = relationship("Quiz", back_populates="attempts")
+    user = relationship("User")
+
+    # Constraints; counting a user's attempts is a range scan of this index.
+    __table_args__ = (
+        UniqueConstraint("quiz_id", "user_id", "attempt_number", name="unique_quiz_attempt_number"),
+    )
@@ -0,0 +1,43 @@
+"""Quiz question model for Supabase database."""
+from datetime import datetime
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class QuizQuestion(Base):
+    """Single-choice question; `correct_choice` indexes into `choices`."""
+
+    __tablename__ = "quiz_questions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    quiz_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("quizzes.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # Canonical order; attempt answers are stored in this order.
+    position = Column(Integer, nullable=False)
+    prompt = Column(Text, nullable=False)
+    choices = Column(JSON, nullable=False)  # List of choice labels
+    correct_choice = Column(Integer, nullable=False)
+    points = Column(Integer, default=1, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+
+    # Relationships
+    quiz = relationship("Quiz", back_populates="questions")
+
+    # Constraints; the leading quiz_id also serves the foreign key lookups.
+    __table_args__ = (
+        UniqueConstraint("quiz_id", "position", name="unique_quiz_question_position"),
+    )
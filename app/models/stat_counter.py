@@ -0,0 +1,22 @@
+"""Named aggregate counters for Supabase database."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from app.db.base import Base
+
+
+class StatCounter(Base):
+    """One running total, adjusted by delta as the rows it counts change."""
+
+    __tablename__ = "stat_counters"
+
+    # e.g. "quizzes.total"; see app.core.quiz_stats for the names in use.
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, default=0, server_default="0", nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
@@ -0,0 +1,100 @@
+"""
+Load-test token checks against Supabase Auth (or the local stub).
+Compares, for the same batch of concurrent get_user calls:
+1. The sync supabase client, one worker thread per in-flight call
+2. The async pooled client with its user cache cleared before each call
+3. The async pooled client with the user cache warm
+
+Start the stub first:
+    python supabase_auth_stub.py --latency-ms 20
+"""
+import asyncio
+import time
+
+import httpx
+
+from app.core.auth_service import AsyncSupabaseAuthService
+
+
+async def create_tokens(url: str, key: str, users: int) -> list[str]:
+    """Sign up throwaway users against the stub and return their access tokens."""
+    tokens = []
+    async with httpx.AsyncClient(base_url=f"{url}/auth/v1", headers={"apikey": key}) as client:
+        for i in range(users):
+            credentials = {"email": f"bench{i}-{time.time_ns()}@example.com", "password": "password123"}
+            response = await client.post("/signup", json=credentials)
+            response.raise_for_status()
+            tokens.append(response.json()["access_token"])
+    return tokens
+
+
+async def run_sync_client(url: str, key: str, tokens: list[str], requests: int, concurrency: int) -> float:
+    from supabase import create_client
+
+    client = create_client(url, key)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def check(token: str) -> None:
+        async with limit:
+            await asyncio.to_thread(client.auth.get_user, token)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(check(tokens[i % len(tokens)]) for i in range(requests)))
+    return time.perf_counter() - started
+
+
+async def run_async_client(
+    service: AsyncSupabaseAuthService,
+    tokens: list[str],
+    requests: int,
+    concurrency: int,
+    cached: bool,
+) -> float:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def check(token: str) -> None:
+        async with limit:
+            if not cached:
+                service.user_cache.clear()
+            await service.get_user(token)
+
+    if cached:
+        await asyncio.gather(*(service.get_user(token) for token in tokens))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(check(tokens[i % len(tokens)]) for i in range(requests)))
+    return time.perf_counter() - started
+
+
+async def run_benchmark(url: str, key: str, users: int, requests: int, concurrency: int) -> None:
+    tokens = await create_tokens(url, key, users)
+    service = AsyncSupabaseAuthService(url=url, key=key)
+    try:
+        results = {
+            "sync client (threads)": await run_sync_client(url, key, tokens, requests, concurrency),
+            "async pooled, cache cold": await run_async_client(service, tokens, requests, concurrency, cached=False),
+            "async pooled, cache warm": await run_async_client(service, tokens, requests, concurrency, cached=True),
+        }
+    finally:
+        await service.aclose()
+
+    print(f"\n{requests} get_user calls over {users} tokens, concurrency {concurrency}")
+    print("=" * 70)
+    baseline = next(iter(results.values()))
+    for name, total in results.items():
+        print(f"  {name:<30} {requests / total:9.1f} req/s  {total / requests * 1000:8.2f} ms/req  ({baseline / total:6.1f}x)")
+    print()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark Supabase Auth token checks")
+    parser.add_argument("--url", default="http://127.0.0.1:54321", help="Supabase (or stub) URL")
+    parser.add_argument("--key", default="stub-anon-key", help="Supabase anon key")
+    parser.add_argument("--users", type=int, default=50, help="Distinct users/tokens")
+    parser.add_argument("--requests", type=int, default=2000, help="Total get_user calls per variant")
+    parser.add_argument("--concurrency", type=int, default=50, help="Calls in flight at once")
+
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.url, args.key, args.users, args.requests, args.concurrency))
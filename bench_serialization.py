@@ -0,0 +1,75 @@
+"""
+Benchmark JSON encoding cost per request for the hot homepage route.
+Compares:
+1. The default FastAPI path (response_model re-validation + jsonable_encoder + json.dumps)
+2. orjson encoding of the freshly built response model
+3. Serving already-encoded bytes from the feed cache
+"""
+from datetime import datetime, timedelta
+import json
+import timeit
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.routes.homepage import HomepageFeedResponse, HomepagePostResponse
+from app.core.serialization import dumps
+
+
+def build_payload(popular_limit: int) -> HomepageFeedResponse:
+    """Build a homepage payload shaped like a real feed response."""
+    now = datetime.utcnow()
+    posts = [
+        HomepagePostResponse(
+            id=str(uuid.uuid4()),
+            title=f"Test Post {i}: Platform Features",
+            description="Testing platform features with a realistic excerpt length. " * 3,
+            created_at=(now - timedelta(hours=i)).isoformat(),
+            author=str(uuid.uuid4()),
+            image_url="https://example.supabase.co/storage/v1/object/public/post-images/garuda_icon.png",
+        )
+        for i in range(popular_limit + 1)
+    ]
+    return HomepageFeedResponse(status="ok", latest_post=posts[0], popular_posts=posts[1:])
+
+
+def encode_default(payload: HomepageFeedResponse) -> bytes:
+    """What FastAPI does for a returned model with a response_model."""
+    validated = HomepageFeedResponse.model_validate(payload.model_dump())
+    return json.dumps(
+        jsonable_encoder(validated),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def run_benchmark(popular_limit: int = 20, number: int = 5000) -> None:
+    payload = build_payload(popular_limit)
+    cache = {("homepage", popular_limit): dumps(payload)}
+
+    results = {
+        "default (validate + jsonable_encoder + json)": timeit.timeit(lambda: encode_default(payload), number=number),
+        "orjson (fresh model)": timeit.timeit(lambda: dumps(payload), number=number),
+        "cached bytes": timeit.timeit(lambda: cache[("homepage", popular_limit)], number=number),
+    }
+
+    print(f"\nHomepage payload with {popular_limit + 1} posts, {number} iterations")
+    print("=" * 70)
+    baseline = next(iter(results.values()))
+    for name, total in results.items():
+        per_request_us = total / number * 1_000_000
+        print(f"  {name:<46} {per_request_us:9.2f} µs/request  ({baseline / total:7.1f}x)")
+    print()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark homepage JSON encoding")
+    parser.add_argument("--popular-limit", type=int, default=20, help="Posts in popular_posts")
+    parser.add_argument("--number", type=int, default=5000, help="Iterations per variant")
+
+    args = parser.parse_args()
+    run_benchmark(popular_limit=args.popular_limit, number=args.number)
@@ -1,103 +1,58 @@
 """
-Database seeder with Supabase Storage image upload.
+Database seeder with the Garuda image stored like an upload.
 This will:
-1. Upload the Garuda image to Supabase Storage
+1. Work out the image's content-addressed URL
 2. Create mock users
-3. Create mock posts using the uploaded image
+3. Create mock posts using the image
+4. Store the image and its resized variants as blobs (STORAGE_BACKEND)
+   and record them as each post's assets
 """
+import asyncio
+import hashlib
 import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal, engine
+from app.db.session import AsyncSessionLocal, SessionLocal, async_engine, engine
 from app.models.user import User
 from app.models.post import Post
-from app.core.config import SUPABASE_URL, SUPABASE_KEY
+from app.models.assets import Asset
+from app.core.blobs import acquire_or_store_blob, blob_key
+from app.core.images import (
+    RenderResult,
+    get_image_executor,
+    render_variants,
+    shutdown_image_executor,
+    store_variant_assets,
+)
+from app.core.storage import storage
 
-# Import Supabase client for storage
-from supabase import create_client
+PLACEHOLDER_IMAGE_URL = "https://i.ibb.co.com/Kx9bs0zv/Garuda-Icon-Featuring-Networked-Wings-and-Typography-2.png"
 
 
-def upload_image_to_supabase(image_path: str, bucket_name: str = "post-images") -> str:
+def stored_image_url(image_path: str) -> str:
     """
-    Upload image to Supabase Storage and return public URL.
+    Public URL the image will have once stored as a content-addressed blob.
+    
+    The image itself is written in step 4, through the same blob path as
+    uploads, to whichever STORAGE_BACKEND is configured.
     
     Args:
         image_path: Path to the image file
-        bucket_name: Name of the Supabase storage bucket
     
     Returns:
-        Public URL of the uploaded image
+        Public URL of the stored image
     """
-    print(f"\n📤 Uploading image to Supabase Storage...")
-    
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        print("⚠️  Supabase credentials not found!")
-        print("Set SUPABASE_URL and SUPABASE_KEY in your environment variables.")
+    if not os.path.exists(image_path):
+        print(f"❌ Image file not found: {image_path}")
         print("Using placeholder URL instead...")
-        return "https://i.ibb.co.com/Kx9bs0zv/Garuda-Icon-Featuring-Networked-Wings-and-Typography-2.png"
+        return PLACEHOLDER_IMAGE_URL
     
-    try:
-        # Create Supabase client
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        
-        # Check if image file exists
-        if not os.path.exists(image_path):
-            print(f"❌ Image file not found: {image_path}")
-            return "https://i.ibb.co.com/Kx9bs0zv/Garuda-Icon-Featuring-Networked-Wings-and-Typography-2.png"
-        
-        # Read the image file
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
-        
-        # Get file name
-        file_name = "garuda_icon.png"
-        
-        # Check if bucket exists, create if not
-        try:
-            buckets = supabase.storage.list_buckets()
-            bucket_exists = any(b['name'] == bucket_name for b in buckets)
-            
-            if not bucket_exists:
-                print(f"📦 Creating bucket '{bucket_name}'...")
-                supabase.storage.create_bucket(bucket_name, options={"public": True})
-                print(f"✓ Bucket '{bucket_name}' created")
-            else:
-                print(f"✓ Bucket '{bucket_name}' already exists")
-        except Exception as e:
-            print(f"⚠️  Could not create/check bucket: {e}")
-            print("Make sure you have the right permissions.")
-        
-        # Upload the image
-        print(f"⬆️  Uploading {file_name}...")
-        
-        # Delete if exists (to allow re-upload)
-        try:
-            supabase.storage.from_(bucket_name).remove([file_name])
-        except:
-            pass  # File might not exist yet
-        
-        # Upload the file
-        result = supabase.storage.from_(bucket_name).upload(
-            file_name,
-            image_data,
-            file_options={"content-type": "image/png"}
-        )
-        
-        # Get public URL
-        public_url = supabase.storage.from_(bucket_name).get_public_url(file_name)
-        
-        print(f"✅ Image uploaded successfully!")
-        print(f"📍 URL: {public_url}")
-        
-        return public_url
-        
-    except Exception as e:
-        print(f"❌ Error uploading image: {e}")
-        print("Using placeholder URL instead...")
-        return "https://i.ibb.co.com/Kx9bs0zv/Garuda-Icon-Featuring-Networked-Wings-and-Typography-2.png"
+    with open(image_path, 'rb') as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    return storage.url_for(blob_key(sha256, "image/png"))
 
 
 def create_mock_users(db: Session) -> list[User]:
@@ -204,7 +159,7 @@ This post also includes the Garuda logo image to show how media is integrated in
         
         post = Post(
             **post_data,
-            image=image_url,  # All posts use the Garuda image
+            image_url=image_url,  # All posts use the Garuda image
             author_id=author.id,
             created_at=created_at,
             updated_at=created_at
@@ -223,6 +178,54 @@ This post also includes the Garuda logo image to show how media is integrated in
     return posts
 
 
+async def store_post_image_assets(post_ids: list, image_data: bytes, result: RenderResult) -> list[Asset]:
+    """Store the image and its variants through the upload path's code and record every asset."""
+    sha256 = hashlib.sha256(image_data).hexdigest()
+    assets = []
+    try:
+        async with AsyncSessionLocal() as db:
+            for post_id in post_ids:
+                # One reference per asset, like an upload of the same content.
+                blob = await acquire_or_store_blob(db, sha256, image_data, "image/png")
+                original = Asset(
+                    post_id=post_id,
+                    blob_hash=blob.hash,
+                    file_url=storage.url_for(blob.storage_key),
+                    media_type=blob.media_type,
+                )
+                assets.append(original)
+                assets.extend(await store_variant_assets(db, original, result))
+            db.add_all(assets)
+            await db.commit()
+    finally:
+        await async_engine.dispose()
+    return assets
+
+
+def create_post_image_assets(db: Session, posts: list[Post], image_path: str) -> list[Asset]:
+    """Attach the Garuda image to each post as an asset, plus thumbnail/medium variants."""
+    print("\n🖼️  Rendering image variants...")
+    
+    if not os.path.exists(image_path):
+        print(f"⚠️  Image file not found: {image_path} (skipping variants)")
+        return []
+    
+    with open(image_path, 'rb') as f:
+        image_data = f.read()
+    
+    # Same image for every post, so render once in the worker pool
+    try:
+        result = get_image_executor().submit(render_variants, image_data).result()
+    finally:
+        shutdown_image_executor()
+    
+    post_ids = [post.id for post in posts]
+    assets = asyncio.run(store_post_image_assets(post_ids, image_data, result))
+    
+    print(f"✓ Created {len(assets)} assets ({len(result.variants)} variants per post)")
+    return assets
+
+
 def seed_database(image_path: str = "garuda_icon.png"):
     """Main seeder function."""
     print("\n" + "="*70)
@@ -233,8 +236,8 @@ def seed_database(image_path: str = "garuda_icon.png"):
     db = SessionLocal()
     
     try:
-        # Step 1: Upload image to Supabase Storage
-        image_url = upload_image_to_supabase(image_path)
+        # Step 1: Work out where the image will be stored
+        image_url = stored_image_url(image_path)
         
         # Step 2: Create users
         users = create_mock_users(db)
@@ -242,6 +245,9 @@ def seed_database(image_path: str = "garuda_icon.png"):
         # Step 3: Create posts
         posts = create_test_posts(db, users, image_url)
         
+        # Step 4: Create image assets and variants
+        assets = create_post_image_assets(db, posts, image_path)
+        
         # Summary
         print("\n" + "="*70)
         print("✅ DATABASE SEEDING COMPLETED!")
@@ -251,6 +257,7 @@ def seed_database(image_path: str = "garuda_icon.png"):
         print(f"  • {len(posts)} posts created")
         print(f"  • {sum(1 for p in posts if p.is_published)} posts published")
         print(f"  • {sum(1 for p in posts if not p.is_published)} drafts")
+        print(f"  • {len(assets)} image assets")
         print(f"\n🖼️  Image URL:")
         print(f"  {image_url}")
         print(f"\n🔑 Test Credentials:")
@@ -0,0 +1,152 @@
+"""
+Local stand-in for the Supabase Auth (GoTrue) endpoints the app uses.
+For offline development and load tests, it implements:
+1. POST /auth/v1/signup and POST /auth/v1/token?grant_type=password
+2. GET /auth/v1/user and POST /auth/v1/logout
+3. GET /auth/v1/.well-known/jwks.json
+
+Tokens are ES256 JWTs signed with a key generated at startup, so local
+verification works against the stub's JWKS. Point the app at it with:
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=stub-anon-key
+"""
+import asyncio
+import json
+import time
+from typing import Optional
+import uuid
+
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+import jwt
+from jwt.algorithms import ECAlgorithm
+from pydantic import BaseModel
+import uvicorn
+
+KEY_ID = "stub-key"
+TOKEN_TTL_SECONDS = 3600
+
+
+class Credentials(BaseModel):
+    email: str
+    password: str
+
+
+def create_stub_app(base_url: str, latency_ms: float = 0.0, anon_key: Optional[str] = None) -> FastAPI:
+    """Build the stub app; `latency_ms` is added to every request to mimic the network."""
+    app = FastAPI(title="Supabase Auth stub")
+    signing_key = ec.generate_private_key(ec.SECP256R1())
+    public_jwk = json.loads(ECAlgorithm.to_jwk(signing_key.public_key()))
+    public_jwk.update(kid=KEY_ID, alg="ES256", use="sig")
+
+    users: dict[str, dict] = {}  # email -> user
+    passwords: dict[str, str] = {}
+    revoked_sessions: set[str] = set()
+    issuer = f"{base_url.rstrip('/')}/auth/v1"
+
+    @app.exception_handler(HTTPException)
+    async def gotrue_error(request: Request, exc: HTTPException) -> JSONResponse:
+        # GoTrue's error shape, so clients read `msg` the same way as in production.
+        return JSONResponse(status_code=exc.status_code, content={"code": exc.status_code, "msg": exc.detail})
+
+    @app.middleware("http")
+    async def gateway(request: Request, call_next):
+        is_public = request.url.path.endswith("/jwks.json")
+        if anon_key and not is_public and request.headers.get("apikey") != anon_key:
+            return Response(status_code=401, content='{"message":"Invalid API key"}', media_type="application/json")
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+    def issue_session(user: dict) -> dict:
+        now = int(time.time())
+        claims = {
+            "sub": user["id"],
+            "email": user["email"],
+            "role": "authenticated",
+            "aud": "authenticated",
+            "iss": issuer,
+            "iat": now,
+            "exp": now + TOKEN_TTL_SECONDS,
+            "session_id": str(uuid.uuid4()),
+        }
+        return {
+            "access_token": jwt.encode(claims, signing_key, algorithm="ES256", headers={"kid": KEY_ID}),
+            "token_type": "bearer",
+            "expires_in": TOKEN_TTL_SECONDS,
+            "expires_at": claims["exp"],
+            "refresh_token": uuid.uuid4().hex,
+            "user": user,
+        }
+
+    def session_claims(authorization: Optional[str]) -> dict:
+        token = (authorization or "").removeprefix("Bearer ").strip()
+        try:
+            claims = jwt.decode(
+                token, signing_key.public_key(), algorithms=["ES256"],
+                audience="authenticated", issuer=issuer,
+            )
+        except jwt.PyJWTError as exc:
+            raise HTTPException(status_code=401, detail=f"invalid JWT: {exc}")
+        if claims["session_id"] in revoked_sessions:
+            raise HTTPException(status_code=403, detail="Session from session_id claim in JWT does not exist")
+        return claims
+
+    @app.get("/auth/v1/.well-known/jwks.json")
+    async def jwks() -> dict:
+        return {"keys": [public_jwk]}
+
+    @app.post("/auth/v1/signup")
+    async def sign_up(credentials: Credentials, redirect_to: Optional[str] = Query(default=None)) -> dict:
+        if credentials.email in users:
+            raise HTTPException(status_code=422, detail="User already registered")
+        user = {
+            "id": str(uuid.uuid4()),
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": credentials.email,
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": {},
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        users[credentials.email] = user
+        passwords[credentials.email] = credentials.password
+        # Behaves like a project with email confirmation turned off.
+        return issue_session(user)
+
+    @app.post("/auth/v1/token")
+    async def token(credentials: Credentials, grant_type: str = Query(...)) -> dict:
+        if grant_type != "password":
+            raise HTTPException(status_code=400, detail="unsupported_grant_type")
+        if passwords.get(credentials.email) != credentials.password:
+            raise HTTPException(status_code=400, detail="Invalid login credentials")
+        return issue_session(users[credentials.email])
+
+    @app.get("/auth/v1/user")
+    async def get_user(authorization: Optional[str] = Header(default=None)) -> dict:
+        claims = session_claims(authorization)
+        user = users.get(claims.get("email"))
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+    @app.post("/auth/v1/logout", status_code=204)
+    async def logout(authorization: Optional[str] = Header(default=None)) -> Response:
+        revoked_sessions.add(session_claims(authorization)["session_id"])
+        return Response(status_code=204)
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local Supabase Auth stub")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=54321, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request")
+    parser.add_argument("--anon-key", default=None, help="Require this apikey header when set")
+
+    args = parser.parse_args()
+    stub = create_stub_app(f"http://{args.host}:{args.port}", latency_ms=args.latency_ms, anon_key=args.anon_key)
+    uvicorn.run(stub, host=args.host, port=args.port, log_level="warning")
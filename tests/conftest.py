@@ -0,0 +1,20 @@
+"""Point the app at a throwaway SQLite database before it is imported."""
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="fiksi-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ["MEDIA_ROOT"] = os.path.join(_workdir, "media")
+os.environ["LEADERBOARD_SNAPSHOT_PATH"] = os.path.join(_workdir, "leaderboards.json")
+os.environ.pop("SUPABASE_URL", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,90 @@
+import hashlib
+import io
+
+import pytest
+from PIL import Image
+from sqlalchemy import select
+
+from app.core.deps import get_verified_user
+from app.core.security import AuthenticatedUser
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Asset, Blob, Post, User
+
+CONTENT = b"plain text attachment"
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture(scope="module")
+def author_post(client):
+    """An unpublished post, so it stays out of the homepage feed."""
+    with SessionLocal() as db:
+        author = User(username="asset_author", email="asset_author@example.com", hashed_password="x", is_active=True)
+        db.add(author)
+        db.flush()
+        post = Post(author_id=author.id, title="Attachments", content="content", is_published=False)
+        db.add(post)
+        db.commit()
+        return author.id, post.id
+
+
+@pytest.fixture
+def post_id(author_post):
+    author_id, post_id = author_post
+    app.dependency_overrides[get_verified_user] = lambda: AuthenticatedUser(author_id, None, None, {})
+    yield post_id
+    app.dependency_overrides.pop(get_verified_user, None)
+
+
+def _upload(client, post_id, **headers):
+    return client.post(
+        "/assets",
+        params={"post_id": str(post_id)},
+        content=CONTENT,
+        headers={"Content-Type": "text/plain", **headers},
+    )
+
+
+def _ref_count():
+    with SessionLocal() as db:
+        return db.get(Blob, SHA256).ref_count
+
+
+def test_reused_blob_is_counted_once_per_asset(client, post_id):
+    assert _upload(client, post_id).status_code == 201
+    assert _ref_count() == 1
+
+    # Same content again, and once more by checksum alone.
+    assert _upload(client, post_id).status_code == 201
+    assert _upload(client, post_id, **{"X-Content-SHA256": SHA256}).status_code == 201
+    assert _ref_count() == 3
+
+
+def test_unknown_checksum_reads_the_body(client, post_id):
+    response = _upload(client, post_id, **{"X-Content-SHA256": "0" * 64})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Checksum mismatch"
+
+
+def _png(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_variant_blobs_are_referenced_per_asset(client, post_id):
+    image = _png(1200, 600)
+    for _ in range(2):
+        # The second upload copies the first one's variants instead of rendering.
+        response = client.post(
+            "/assets",
+            params={"post_id": str(post_id)},
+            content=image,
+            headers={"Content-Type": "image/png"},
+        )
+        assert response.status_code == 201
+
+    with SessionLocal() as db:
+        variant_hashes = select(Asset.blob_hash).where(Asset.variant != "original", Asset.post_id == post_id)
+        counts = db.execute(select(Blob.ref_count).where(Blob.hash.in_(variant_hashes))).scalars().all()
+    assert counts == [2, 2]
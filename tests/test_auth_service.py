@@ -0,0 +1,37 @@
+import asyncio
+
+import httpx
+
+from app.core.auth_service import AsyncSupabaseAuthService
+
+
+def test_cancelled_waiter_does_not_cancel_shared_lookup():
+    async def scenario():
+        requests = 0
+        release = asyncio.Event()
+
+        async def handler(request):
+            nonlocal requests
+            requests += 1
+            await release.wait()
+            return httpx.Response(200, json={"id": "user-1"})
+
+        service = AsyncSupabaseAuthService(url="http://auth.test", key="anon")
+        service._client = httpx.AsyncClient(
+            base_url="http://auth.test/auth/v1",
+            transport=httpx.MockTransport(handler),
+        )
+        first = asyncio.create_task(service.get_user("token"))
+        second = asyncio.create_task(service.get_user("token"))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+
+        assert await second == {"id": "user-1"}
+        assert first.cancelled()
+        assert requests == 1
+        await service.aclose()
+
+    asyncio.run(scenario())
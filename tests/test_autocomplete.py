@@ -0,0 +1,36 @@
+from app.core.autocomplete import autocomplete_backend
+from app.db.session import SessionLocal
+from app.models import User
+
+
+def _usernames(prefix):
+    # Prefix matches only; the fuzzy fallback would also suggest near misses.
+    entries = autocomplete_backend.index.search(prefix, 10)
+    return [entry.username for entry in entries if entry.username.startswith(prefix)]
+
+
+def test_rolled_back_user_writes_leave_index_unchanged(client):
+    with SessionLocal() as db:
+        user = User(username="ac_kept", email="ac_kept@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+
+        db.add(User(username="ac_phantom", email="ac_phantom@example.com", hashed_password="x", is_active=True))
+        user.username = "ac_renamed"
+        db.flush()
+        db.rollback()
+
+    assert _usernames("ac_") == ["ac_kept"]
+
+
+def test_committed_rename_is_indexed(client):
+    with SessionLocal() as db:
+        user = User(username="ac_before", email="ac_before@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+
+        user.username = "ac_after"
+        db.commit()
+
+    assert _usernames("ac_after") == ["ac_after"]
+    assert _usernames("ac_before") == []
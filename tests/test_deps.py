@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+import uuid
+
+import jwt
+import pytest
+
+from app.core.deps import local_user_ids
+from app.core.security import token_verifier
+from app.db.session import SessionLocal
+from app.models import User
+
+
+SECRET = "test-secret-of-at-least-32-bytes!"
+
+
+@pytest.fixture
+def sign(monkeypatch):
+    monkeypatch.setattr(token_verifier, "secret", SECRET)
+    local_user_ids.clear()
+
+    def sign(sub, email):
+        claims = {"sub": str(sub), "email": email, "exp": datetime.utcnow() + timedelta(minutes=5)}
+        if token_verifier.audience:
+            claims["aud"] = token_verifier.audience
+        if token_verifier.issuer:
+            claims["iss"] = token_verifier.issuer
+        return {"Authorization": f"Bearer {jwt.encode(claims, SECRET, algorithm='HS256')}"}
+
+    return sign
+
+
+def test_login_resolves_to_local_user_by_email(client, sign):
+    with SessionLocal() as db:
+        db.add(User(username="deps_member", email="deps_member@example.com", hashed_password="x", is_active=True))
+        db.commit()
+
+    # The auth uid is unrelated to the local users.id.
+    response = client.get("/friends", headers=sign(uuid.uuid4(), "deps_member@example.com"))
+    assert response.status_code == 200
+
+
+def test_login_without_local_account_is_forbidden(client, sign):
+    response = client.get("/friends", headers=sign(uuid.uuid4(), "nobody@example.com"))
+    assert response.status_code == 403
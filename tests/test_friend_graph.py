@@ -0,0 +1,35 @@
+from app.core.friend_graph import friend_graph
+from app.db.session import SessionLocal
+from app.models import Friendship, FriendshipStatus, User
+
+
+def _users(db, *names):
+    users = [User(username=name, email=f"{name}@example.com", hashed_password="x", is_active=True) for name in names]
+    db.add_all(users)
+    db.flush()
+    return [user.id for user in users]
+
+
+def test_rolled_back_friendship_leaves_graph_unchanged(client):
+    with SessionLocal() as db:
+        a, b, c = _users(db, "fg_a", "fg_b", "fg_c")
+        db.add(Friendship(requester_id=a, addressee_id=c, status=FriendshipStatus.ACCEPTED))
+        db.commit()
+
+        db.add(Friendship(requester_id=b, addressee_id=c, status=FriendshipStatus.ACCEPTED))
+        db.flush()
+        db.rollback()
+
+    assert friend_graph.mutuals(a, b) == []
+
+
+def test_committed_friendship_is_indexed(client):
+    with SessionLocal() as db:
+        a, b, c = _users(db, "fg_d", "fg_e", "fg_f")
+        db.add_all([
+            Friendship(requester_id=a, addressee_id=c, status=FriendshipStatus.ACCEPTED),
+            Friendship(requester_id=b, addressee_id=c, status=FriendshipStatus.ACCEPTED),
+        ])
+        db.commit()
+
+    assert friend_graph.mutuals(a, b) == [c]
@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.deps import get_current_user
+from app.core.security import AuthenticatedUser
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Friendship, FriendshipStatus, User
+
+
+@pytest.fixture
+def caller(client):
+    with SessionLocal() as db:
+        users = [
+            User(username=name, email=f"{name}@example.com", hashed_password="x", is_active=True)
+            for name in ("fr_me", "fr_mutual", "fr_one_way")
+        ]
+        db.add_all(users)
+        db.flush()
+        me, mutual, one_way = users
+        db.add_all([
+            # Accepted in both directions for one pair.
+            Friendship(requester_id=me.id, addressee_id=mutual.id, status=FriendshipStatus.ACCEPTED),
+            Friendship(requester_id=mutual.id, addressee_id=me.id, status=FriendshipStatus.ACCEPTED),
+            Friendship(requester_id=one_way.id, addressee_id=me.id, status=FriendshipStatus.ACCEPTED),
+        ])
+        db.commit()
+        me_id = me.id
+
+    app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(me_id, None, None, {})
+    yield me_id
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_friend_with_rows_in_both_directions_is_listed_once(client, caller):
+    usernames = []
+    cursor = None
+    while True:
+        params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/friends", params=params).json()
+        usernames += [item["user"]["username"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(usernames) == ["fr_mutual", "fr_one_way"]
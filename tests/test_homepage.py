@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.core.feed_cache import FEED_VERSION, feed_cache
+from app.db.session import SessionLocal, async_engine
+from app.models import Asset, Post, StatCounter, User
+
+
+@pytest.fixture(scope="module")
+def posts(client):
+    """25 published posts, each by a different author and with two assets."""
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        authors = [
+            User(username=f"author{i}", email=f"author{i}@example.com", hashed_password="x", is_active=True)
+            for i in range(25)
+        ]
+        db.add_all(authors)
+        db.flush()
+        posts = [
+            Post(
+                author_id=author.id,
+                title=f"Post {i}",
+                content="content",
+                is_published=True,
+                created_at=now - timedelta(minutes=i),
+            )
+            for i, author in enumerate(authors)
+        ]
+        db.add_all(posts)
+        db.flush()
+        db.add_all(
+            Asset(post_id=post.id, file_url=f"http://files/{post.id}/{n}", media_type="image/png")
+            for post in posts
+            for n in range(2)
+        )
+        db.commit()
+        return [post.id for post in posts]
+
+
+@contextmanager
+def count_statements():
+    counter = {"statements": 0}
+
+    def before_cursor_execute(*args):
+        counter["statements"] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _statements_for_page(client, limit: int) -> int:
+    feed_cache.clear()
+    with count_statements() as counter:
+        response = client.get("/homepage/posts", params={"limit": limit})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == limit
+    assert all(item["author_summary"] and len(item["assets"]) == 2 for item in items)
+    return counter["statements"]
+
+
+def test_homepage_posts_query_count_does_not_grow_with_page_size(client, posts):
+    # Warm up, so one-off startup work isn't counted.
+    _statements_for_page(client, 2)
+
+    assert _statements_for_page(client, 2) == _statements_for_page(client, 20)
+
+
+def test_author_rename_invalidates_cached_feed(client, posts):
+    first = client.get("/homepage/posts", params={"limit": 1})
+    etag = first.headers["etag"]
+    author_id = first.json()["items"][0]["author_summary"]["id"]
+
+    with SessionLocal() as db:
+        db.get(User, uuid.UUID(author_id)).username = "renamed_author"
+        db.commit()
+
+    second = client.get("/homepage/posts", params={"limit": 1}, headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.json()["items"][0]["author_summary"]["username"] == "renamed_author"
+
+
+def test_feed_version_bumps_once_per_flush(client, posts):
+    with SessionLocal() as db:
+        before = db.get(StatCounter, FEED_VERSION).value
+        db.add_all(
+            Asset(post_id=posts[-1], file_url=f"http://files/extra/{n}", media_type="image/png")
+            for n in range(3)
+        )
+        db.commit()
+        db.expire_all()
+        assert db.get(StatCounter, FEED_VERSION).value == before + 1
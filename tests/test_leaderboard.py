@@ -0,0 +1,41 @@
+from datetime import datetime
+import uuid
+
+from app.core.leaderboard import LeaderboardIndex, leaderboards
+from app.db.session import SessionLocal
+from app.models import Quiz, QuizAttempt, User
+
+
+def test_rolled_back_quiz_delete_keeps_board(client):
+    with SessionLocal() as db:
+        user = User(username="lb_player", email="lb_player@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        quiz = Quiz(author_id=user.id, title="Board", is_public=True)
+        db.add(quiz)
+        db.flush()
+        db.add(QuizAttempt(
+            quiz_id=quiz.id,
+            user_id=user.id,
+            attempt_number=1,
+            score=80.0,
+            finished_at=datetime.utcnow(),
+            time_used_seconds=30,
+        ))
+        db.commit()
+        quiz_id = quiz.id
+        assert leaderboards.size(quiz_id) == 1
+
+        db.delete(quiz)
+        db.flush()
+        db.rollback()
+
+    assert leaderboards.size(quiz_id) == 1
+
+
+def test_snapshot_leaves_no_partial_files(tmp_path):
+    index = LeaderboardIndex(snapshot_path=tmp_path / "leaderboards.json")
+    index.record(uuid.uuid4(), uuid.uuid4(), 50.0, 10)
+    index.save_snapshot()
+
+    assert [path.name for path in tmp_path.iterdir()] == ["leaderboards.json"]
@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.api.routes.quizzes import _is_attempt_number_conflict
+from app.core.deps import get_current_user
+from app.core.leaderboard import leaderboards
+from app.core.security import AuthenticatedUser
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Quiz, QuizQuestion, User
+
+
+@pytest.fixture(scope="module")
+def quiz(client):
+    with SessionLocal() as db:
+        user = User(username="quiz_taker", email="quiz_taker@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.flush()
+        quiz = Quiz(author_id=user.id, title="Capitals", is_public=True)
+        db.add(quiz)
+        db.flush()
+        db.add(QuizQuestion(quiz_id=quiz.id, position=0, prompt="Capital of Indonesia?", choices=["Jakarta", "Bandung"], correct_choice=0))
+        db.commit()
+        return user.id, quiz.id
+
+
+@pytest.fixture
+def quiz_id(quiz):
+    user_id, quiz_id = quiz
+    app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(user_id, None, None, {})
+    yield quiz_id
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_attempt_is_graded_once(client, quiz_id):
+    attempt = client.post(f"/quizzes/{quiz_id}/attempts").json()
+    question_id = attempt["questions"][0]["id"]
+    submission = {"answers": [{"question_id": question_id, "choice": 0}]}
+
+    first = client.post(f"/quizzes/{quiz_id}/attempts/{attempt['id']}/submit", json=submission)
+    assert first.status_code == 200
+    assert first.json()["score"] == 100.0
+    assert leaderboards.size(quiz_id) == 1
+
+    second = client.post(f"/quizzes/{quiz_id}/attempts/{attempt['id']}/submit", json=submission)
+    assert second.status_code == 409
+
+
+def _integrity_error(message):
+    return IntegrityError("INSERT INTO quiz_attempts ...", {}, sqlite3.IntegrityError(message))
+
+
+def test_only_attempt_number_conflicts_count_as_races():
+    assert _is_attempt_number_conflict(_integrity_error(
+        "UNIQUE constraint failed: quiz_attempts.quiz_id, quiz_attempts.user_id, quiz_attempts.attempt_number"
+    ))
+    assert not _is_attempt_number_conflict(_integrity_error("FOREIGN KEY constraint failed"))
@@ -0,0 +1,45 @@
+from app.core.ranking import popularity_index
+from app.db.session import SessionLocal
+from app.models import Post, User
+
+
+def _author(db, name):
+    author = User(username=name, email=f"{name}@example.com", hashed_password="x", is_active=True)
+    db.add(author)
+    db.flush()
+    return author
+
+
+def test_rolled_back_post_writes_leave_ranking_unchanged(client):
+    with SessionLocal() as db:
+        author = _author(db, "rank_a")
+        live = Post(author_id=author.id, title="Live", content="content", is_published=True)
+        db.add(live)
+        db.commit()
+        live_id = live.id
+
+        phantom = Post(author_id=author.id, title="Phantom", content="content", is_published=True)
+        db.add(phantom)
+        live.is_published = False
+        db.flush()
+        phantom_id = phantom.id
+        db.rollback()
+
+    ranked = popularity_index.top(1000)
+    assert live_id in ranked
+    assert phantom_id not in ranked
+
+
+def test_post_update_keeps_indexed_views(client):
+    with SessionLocal() as db:
+        author = _author(db, "rank_b")
+        post = Post(author_id=author.id, title="Viewed", content="content", is_published=True)
+        db.add(post)
+        db.commit()
+
+        popularity_index.add_views(post.id, 5)
+        post.title = "Viewed, edited"
+        db.commit()
+        post_id = post.id
+
+    assert popularity_index._entries[post_id].views == 5
@@ -0,0 +1,26 @@
+import asyncio
+
+from app.core.ranking import popularity_index
+from app.core.view_counter import view_counter
+from app.db.session import SessionLocal
+from app.models import Post, User
+
+
+def test_homepage_impressions_do_not_feed_popularity(client):
+    with SessionLocal() as db:
+        author = User(username="vc_author", email="vc_author@example.com", hashed_password="x", is_active=True)
+        db.add(author)
+        db.flush()
+        post = Post(author_id=author.id, title="Counted", content="content", is_published=True)
+        db.add(post)
+        db.commit()
+        post_id = post.id
+
+    view_counter.record_impressions([post_id, post_id])
+    view_counter.record(post_id)
+    asyncio.run(view_counter.flush())
+
+    with SessionLocal() as db:
+        post = db.get(Post, post_id)
+        assert (post.view_count, post.impression_count) == (1, 2)
+    assert popularity_index._entries[post_id].views == 1